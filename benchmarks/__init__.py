@@ -0,0 +1,8 @@
+"""
+Нагрузочный замер yatube.
+
+Запуск: python -m benchmarks --help. Пакет создаёт временную базу,
+наполняет её фабриками и гоняет ленты, страницы постов и запись через
+WSGI-приложение yatube/wsgi.py в несколько потоков, а итог печатает
+в JSON, чтобы сравнивать коммиты между собой.
+"""
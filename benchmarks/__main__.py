@@ -0,0 +1,89 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import django
+
+
+def parse_args(argv, scenarios):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Нагрузочный замер лент и записи yatube через WSGI")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--groups", type=int, default=10)
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=500,
+                        help="запросов на каждый сценарий")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--scenario", action="append",
+                        choices=scenarios, dest="scenarios",
+                        help="по умолчанию все сценарии")
+    parser.add_argument("--production", action="store_true",
+                        help="PRAGMA SQLite, кеш страниц и прогрев шаблонов "
+                             "как в продакшене")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="-",
+                        help="файл для JSON-отчёта, - для stdout")
+    return parser.parse_args(argv)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+            check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def configure(database, production):
+    """Направляет Django во временную базу до первого подключения."""
+    from django.conf import settings
+
+    settings.DEBUG = False
+    settings.DATABASES["default"]["NAME"] = database
+    if production:
+        settings.SQLITE_PRAGMAS = settings.SQLITE_PRODUCTION_PRAGMAS
+        settings.POSTS_FEED_CACHE_TIMEOUT = 60
+        settings.TEMPLATES_WARM_ON_BOOT = True
+        settings.DATABASES["default"]["CONN_MAX_AGE"] = 600
+
+
+def main(argv=None):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "yatube.settings")
+    django.setup()
+    from django.core.management import call_command
+
+    from .factories import seed
+    from .scenarios import SCENARIOS, Corpus, run_scenario
+
+    args = parse_args(argv, SCENARIOS)
+    with tempfile.TemporaryDirectory() as directory:
+        configure(os.path.join(directory, "benchmark.sqlite3"),
+                  args.production)
+        from yatube.wsgi import application
+
+        call_command("migrate", verbosity=0)
+        seed(users=args.users, groups=args.groups, posts=args.posts,
+             random_seed=args.seed)
+        corpus = Corpus()
+        results = {
+            name: run_scenario(application, SCENARIOS[name], corpus,
+                               args.requests, args.workers, args.seed)
+            for name in args.scenarios or SCENARIOS
+        }
+    report = {"commit": git_commit(), "config": vars(args),
+              "scenarios": results}
+    if args.output == "-":
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, "w", encoding="utf-8") as stream:
+            json.dump(report, stream, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
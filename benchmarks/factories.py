@@ -0,0 +1,62 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from posts.counters import recount
+from posts.models import Group, Post, User
+from posts.transfer import insert_posts
+
+PASSWORD = "benchmark-password"
+WORDS = ("лето", "город", "река", "книга", "друг", "дорога", "вечер",
+         "музыка", "окно", "ветер", "утро", "поезд", "сад", "море")
+
+
+def make_text(rng, words=40):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def create_users(count, batch_size=1000):
+    # хеш пароля дорогой, поэтому он один на всех
+    password = make_password(PASSWORD)
+    User.objects.bulk_create(
+        (User(username=f"user{i}", first_name=f"Имя{i}",
+              last_name=f"Фамилия{i}", password=password)
+         for i in range(count)),
+        batch_size=batch_size,
+    )
+    return list(User.objects.order_by("pk").values_list("pk", flat=True))
+
+
+def create_groups(count, batch_size=1000):
+    Group.objects.bulk_create(
+        (Group(title=f"Группа {i}", slug=f"group{i}",
+               description=f"Описание группы {i}")
+         for i in range(count)),
+        batch_size=batch_size,
+    )
+    return list(Group.objects.order_by("pk").values_list("pk", flat=True))
+
+
+def create_posts(count, author_ids, group_ids, rng, batch_size=1000):
+    now = timezone.now()
+
+    def posts():
+        for i in range(count):
+            # каждый третий пост без группы
+            group_id = rng.choice(group_ids) if i % 3 else None
+            yield Post(text=make_text(rng), author_id=rng.choice(author_ids),
+                       group_id=group_id,
+                       pub_date=now - timedelta(minutes=count - i))
+
+    insert_posts(posts(), batch_size=batch_size)
+
+
+def seed(users=100, groups=10, posts=5000, random_seed=0):
+    """Наполняет пустую базу и пересчитывает счётчики постов."""
+    rng = random.Random(random_seed)
+    author_ids = create_users(users)
+    group_ids = create_groups(groups)
+    create_posts(posts, author_ids, group_ids, rng)
+    recount()
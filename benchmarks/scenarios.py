@@ -0,0 +1,184 @@
+import io
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from urllib.parse import urlencode
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.contrib.auth import (BACKEND_SESSION_KEY, HASH_SESSION_KEY,
+                                 SESSION_KEY)
+from django.db import connections
+from django.utils.crypto import get_random_string
+
+from posts.models import Group, Post, User
+
+from .factories import make_text
+
+
+def make_cookie(user):
+    """Куки вошедшего пользователя: сессия и CSRF-токен для форм."""
+    engine = import_module(settings.SESSION_ENGINE)
+    session = engine.SessionStore()
+    session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.save()
+    # одинаковый токен в куке и в форме проходит проверку CSRF
+    token = get_random_string(64)
+    cookie = (f"{settings.SESSION_COOKIE_NAME}={session.session_key}; "
+              f"{settings.CSRF_COOKIE_NAME}={token}")
+    return cookie, token
+
+
+class Corpus:
+    """Что есть в базе после наполнения: из этого собираются запросы."""
+
+    def __init__(self):
+        self.slugs = list(Group.objects.values_list("slug", flat=True))
+        self.posts = list(Post.objects.values_list("pk", "author__username",
+                                                   "author_id"))
+        self.pages = max(1, len(self.posts) // settings.POSTS_PER_PAGE)
+        users = User.objects.all()
+        self.usernames = [user.username for user in users]
+        self.cookies = {user.pk: make_cookie(user) for user in users}
+
+
+class Request:
+    def __init__(self, path, query=None, form=None, cookie=None):
+        self.path = path
+        self.query = urlencode(query or {})
+        self.form = form
+        self.cookie = cookie
+
+    @property
+    def expected_status(self):
+        # формы после записи перенаправляют
+        return 302 if self.form is not None else 200
+
+    def environ(self):
+        body = urlencode(self.form).encode() if self.form is not None else b""
+        environ = {
+            "REQUEST_METHOD": "POST" if self.form is not None else "GET",
+            "PATH_INFO": self.path,
+            "QUERY_STRING": self.query,
+            "HTTP_HOST": "localhost",
+            "SERVER_NAME": "localhost",
+            "CONTENT_TYPE": "application/x-www-form-urlencoded",
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.input": io.BytesIO(body),
+        }
+        if self.cookie:
+            environ["HTTP_COOKIE"] = self.cookie
+        setup_testing_defaults(environ)
+        return environ
+
+
+def index(rng, corpus):
+    return Request("/", {"page": rng.randint(1, corpus.pages)})
+
+
+def group_posts(rng, corpus):
+    return Request(f"/group/{rng.choice(corpus.slugs)}/")
+
+
+def profile(rng, corpus):
+    return Request(f"/{rng.choice(corpus.usernames)}/")
+
+
+def post_view(rng, corpus):
+    pk, username, _ = rng.choice(corpus.posts)
+    return Request(f"/{username}/{pk}/")
+
+
+def new_post(rng, corpus):
+    _, _, author_id = rng.choice(corpus.posts)
+    cookie, token = corpus.cookies[author_id]
+    return Request("/new/", form={
+        "text": make_text(rng), "csrfmiddlewaretoken": token,
+    }, cookie=cookie)
+
+
+def post_edit(rng, corpus):
+    pk, username, author_id = rng.choice(corpus.posts)
+    cookie, token = corpus.cookies[author_id]
+    return Request(f"/{username}/{pk}/edit/", form={
+        "text": make_text(rng), "csrfmiddlewaretoken": token,
+    }, cookie=cookie)
+
+
+SCENARIOS = {
+    "index": index,
+    "group_posts": group_posts,
+    "profile": profile,
+    "post_view": post_view,
+    "NewPost": new_post,
+    "post_edit": post_edit,
+}
+
+
+def call(application, environ):
+    """Прогоняет один запрос через WSGI и возвращает код ответа."""
+    statuses = []
+
+    def start_response(status, headers, exc_info=None):
+        statuses.append(status)
+
+    result = application(environ, start_response)
+    try:
+        for _ in result:
+            pass
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+    return int(statuses[0].split()[0])
+
+
+def percentile(latencies, q):
+    if len(latencies) < 2:
+        return latencies[0] if latencies else 0
+    return statistics.quantiles(latencies, n=100)[q - 1]
+
+
+def run_scenario(application, scenario, corpus, requests, workers,
+                 random_seed=0):
+    """
+    Отправляет requests запросов сценария из workers потоков.
+
+    Возвращает задержки в миллисекундах по перцентилям и пропускную
+    способность в запросах в секунду.
+    """
+    def worker(count, seed):
+        rng = random.Random(seed)
+        latencies, errors = [], 0
+        try:
+            for _ in range(count):
+                request = scenario(rng, corpus)
+                started = time.perf_counter()
+                status = call(application, request.environ())
+                latencies.append((time.perf_counter() - started) * 1000)
+                if status != request.expected_status:
+                    errors += 1
+        finally:
+            # у каждого потока своё соединение с базой
+            connections.close_all()
+        return latencies, errors
+
+    shares = [requests // workers + (i < requests % workers)
+              for i in range(workers)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(worker, shares,
+                                [random_seed + i for i in range(workers)]))
+    elapsed = time.perf_counter() - started
+    latencies = [value for values, _ in results for value in values]
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors for _, errors in results),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
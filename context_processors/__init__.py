@@ -0,0 +1,11 @@
+def provides(*keys):
+    """
+    Объявляет ключи, которые возвращает контекст-процессор.
+
+    Такой процессор вызывается, только когда шаблон читает один
+    из его ключей (см. posts.templating.ProcessorContext).
+    """
+    def decorator(processor):
+        processor.context_keys = keys
+        return processor
+    return decorator
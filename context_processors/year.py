@@ -1,5 +1,24 @@
 import datetime as dt
+import time
 
+from . import provides
 
+# год и момент, до которого он верен: следующая полночь по местному времени
+_year = None
+_expires = 0
+
+
+def current_year():
+    """Текущий год, который пересчитывается раз в сутки на процесс."""
+    global _year, _expires
+    now = time.time()
+    if now >= _expires:
+        today = dt.datetime.fromtimestamp(now).date()
+        midnight = dt.datetime.combine(today + dt.timedelta(days=1), dt.time())
+        _year, _expires = today.year, midnight.timestamp()
+    return _year
+
+
+@provides("year")
 def year(request):
-    return {"year": dt.datetime.now().year}
+    return {"year": current_year()}
@@ -3,3 +3,11 @@ from django.apps import AppConfig
 
 class PostsConfig(AppConfig):
     name = 'posts'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_migrate
+
+        from . import checks, signals, sqlite  # noqa: F401
+        post_migrate.connect(signals.restore_search_index, sender=self)
+        connection_created.connect(sqlite.tune_connection)
@@ -0,0 +1,82 @@
+"""
+Вошедший пользователь без запроса к базе.
+
+CachedModelBackend держит в памяти процесса последних вошедших
+пользователей. Запись годна, пока не сменилась версия пользователя в общем
+кеше, а её сбрасывает любое сохранение или удаление пользователя (в том
+числе смена пароля) и выход из аккаунта, на каком бы воркере он ни случился.
+"""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import ValidationError
+
+from . import versions
+
+
+class UserCache:
+    """LRU значений полей пользователей: pk -> (версия, база, значения)."""
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, pk, version):
+        with self.lock:
+            entry = self.entries.get(pk)
+            if entry is None or entry[0] != version:
+                return None
+            self.entries.move_to_end(pk)
+            return entry[1:]
+
+    def put(self, pk, version, alias, values):
+        with self.lock:
+            self.entries[pk] = (version, alias, values)
+            self.entries.move_to_end(pk)
+            while len(self.entries) > settings.AUTH_USER_CACHE_SIZE:
+                self.entries.popitem(last=False)
+
+    def discard(self, pk):
+        with self.lock:
+            self.entries.pop(pk, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+users = UserCache()
+
+
+def forget_user(pk):
+    """Сбрасывает пользователя в кеше этого процесса и во всех остальных."""
+    users.discard(pk)
+    versions.bump(versions.user_key(pk))
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        if not settings.AUTH_USER_CACHE_SIZE:
+            return super().get_user(user_id)
+        model = get_user_model()
+        try:
+            pk = model._meta.pk.to_python(user_id)
+        except ValidationError:
+            return None
+        fields = model._meta.concrete_fields
+        version = versions.get_versions([versions.user_key(pk)])
+        cached = users.get(pk, version)
+        if cached is not None:
+            alias, values = cached
+            # каждому запросу свой объект: кеш прав и правки полей
+            # не должны переходить между запросами
+            return model.from_db(alias, [field.attname for field in fields],
+                                 values)
+        user = super().get_user(pk)
+        if user is not None:
+            users.put(pk, version, user._state.db,
+                      tuple(getattr(user, field.attname) for field in fields))
+        return user
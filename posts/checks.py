@@ -0,0 +1,59 @@
+"""
+Проверки настроек, которые Django запускает при старте и в manage.py check.
+
+Версии в кеше (posts.versions), закешированные сессии и пользователи
+сбрасываются только там, куда дошёл сброс. С кешем в памяти процесса
+это один воркер из многих, поэтому такие режимы требуют общего кеша.
+"""
+from django.conf import settings
+from django.core import checks
+
+# кеши, которые видит только один процесс
+PROCESS_LOCAL_CACHES = {"django.core.cache.backends.locmem.LocMemCache"}
+# движки сессий, которые читают сессию из кеша
+CACHED_SESSION_ENGINES = {
+    "django.contrib.sessions.backends.cache",
+    "django.contrib.sessions.backends.cached_db",
+}
+
+
+def cache_is_shared(alias="default"):
+    return settings.CACHES[alias]["BACKEND"] not in PROCESS_LOCAL_CACHES
+
+
+@checks.register(checks.Tags.caches, checks.Tags.security)
+def check_auth_cache(app_configs, **kwargs):
+    if cache_is_shared():
+        return []
+    errors = []
+    if settings.AUTH_USER_CACHE_SIZE:
+        errors.append(checks.Error(
+            "AUTH_USER_CACHE_SIZE требует общего кеша: со сменой пароля "
+            "и выходом на одном воркере остальные об этом не узнают.",
+            hint="Настройте в CACHES['default'] memcached или redis "
+                 "либо поставьте AUTH_USER_CACHE_SIZE = 0.",
+            id="posts.E001",
+        ))
+    if settings.SESSION_ENGINE in CACHED_SESSION_ENGINES:
+        errors.append(checks.Error(
+            f"{settings.SESSION_ENGINE} требует общего кеша: удалённая "
+            "при выходе сессия остаётся в кеше других воркеров.",
+            hint="Настройте общий кеш либо используйте движок сессий "
+                 "db или signed_cookies.",
+            id="posts.E002",
+        ))
+    return errors
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    # кеш страниц включён только в продакшене (DEBUG = False)
+    if not settings.POSTS_FEED_CACHE_TIMEOUT or cache_is_shared():
+        return []
+    return [checks.Warning(
+        "Кеш в памяти процесса: сброс версий доходит только до воркера, "
+        "где изменились данные. Остальные отдают старые карточки постов "
+        "до часа, а страницы лент — до POSTS_FEED_CACHE_TIMEOUT секунд.",
+        hint="В продакшене в CACHES['default'] нужен memcached или redis.",
+        id="posts.W001",
+    )]
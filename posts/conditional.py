@@ -0,0 +1,79 @@
+from django.db.models import OuterRef, Subquery
+from django.http import Http404
+
+from . import versions
+from .counters import author_posts_count
+from .models import Post, User
+
+
+def _memoized(request, name, compute):
+    # результат нужен и ETag, и самому представлению
+    if not hasattr(request, name):
+        setattr(request, name, compute())
+    return getattr(request, name)
+
+
+def _etag(request, *parts):
+    return "-".join(str(part) for part in parts
+                    + (request.GET.urlencode(), request.user.pk))
+
+
+def author_post(request, username, post_id):
+    """Пост страницы: один запрос и для валидаторов, и для представления."""
+    post = _memoized(
+        request, "_author_post",
+        lambda: Post.objects.of_author(username, post_id).first())
+    if post is None:
+        raise Http404("Пост не найден")
+    return post
+
+
+def post_etag(request, username, post_id):
+    def compute():
+        try:
+            post = author_post(request, username, post_id)
+        except Http404:
+            return None
+        version = versions.get_versions([
+            versions.group_key(post.group_id),
+            versions.author_key(post.author_id),
+        ])
+        return _etag(request, post.updated.timestamp(),
+                     author_posts_count(post.author), version)
+    return _memoized(request, "_post_etag", compute)
+
+
+def profile_author(request, username):
+    """
+    Автор профиля вместе со счётчиком постов и датой последней правки.
+
+    Один запрос на страницу: его результат нужен и валидаторам,
+    и самому представлению.
+    """
+    def compute():
+        latest = (Post.objects.filter(author=OuterRef("pk"))
+                  .order_by("-updated").values("updated")[:1])
+        return (User.objects.select_related("post_counter")
+                .annotate(latest_update=Subquery(latest))
+                .filter(username=username).first())
+    author = _memoized(request, "_profile_author", compute)
+    if author is None:
+        raise Http404("Автор не найден")
+    return author
+
+
+def profile_etag(request, username):
+    def compute():
+        try:
+            author = profile_author(request, username)
+        except Http404:
+            return None
+        posts_count = author_posts_count(author)
+        # на карточках постов видны названия групп
+        version = versions.get_versions([versions.author_key(author.pk),
+                                         versions.GROUPS_VERSION])
+        latest = author.latest_update
+        stamp = latest.timestamp() if latest else 0
+        return _etag(request, stamp, posts_count, version)
+    return _memoized(request, "_profile_etag", compute)
+
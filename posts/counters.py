@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import AuthorCounter, Group, Post
+
+INDEX_COUNT_KEY = "posts:count:all"
+
+
+def index_count(queryset):
+    """
+    Количество постов в общей ленте из кеша.
+
+    Точный COUNT(*) выполняется только при промахе, то есть не чаще раза
+    в POSTS_COUNT_TIMEOUT секунд: это и есть периодическая сверка счётчика.
+    """
+    count = cache.get(INDEX_COUNT_KEY)
+    if count is None:
+        count = queryset.count()
+        cache.set(INDEX_COUNT_KEY, count, settings.POSTS_COUNT_TIMEOUT)
+    return count
+
+
+def author_posts_count(author):
+    counter = getattr(author, "post_counter", None)
+    return counter.posts_count if counter is not None else 0
+
+
+def adjust_index_count(delta):
+    try:
+        cache.incr(INDEX_COUNT_KEY, delta)
+    except ValueError:
+        # счётчик ещё не закеширован — его посчитают при чтении
+        pass
+
+
+def adjust_group_count(group_id, delta):
+    if group_id is None:
+        return
+    groups = Group.objects.filter(pk=group_id)
+    if delta < 0:
+        groups = groups.filter(posts_count__gte=-delta)
+    groups.update(posts_count=F("posts_count") + delta)
+
+
+def adjust_author_count(author_id, delta):
+    counters = AuthorCounter.objects.filter(author_id=author_id)
+    if delta < 0:
+        counters = counters.filter(posts_count__gte=-delta)
+    if counters.update(posts_count=F("posts_count") + delta) or delta < 0:
+        return
+    # первый пост автора: строки счётчика ещё нет
+    try:
+        with transaction.atomic():
+            AuthorCounter.objects.create(
+                author_id=author_id,
+                posts_count=Post.objects.filter(author_id=author_id).count(),
+            )
+    except IntegrityError:
+        AuthorCounter.objects.filter(author_id=author_id).update(
+            posts_count=F("posts_count") + delta)
+
+
+def recount(author_ids=None, group_ids=None):
+    """
+    Пересчитывает счётчики постов по таблице постов.
+
+    Без аргументов пересчитывает все группы и всех авторов.
+    """
+    groups = Group.objects.all()
+    if group_ids is not None:
+        groups = groups.filter(pk__in=group_ids)
+    group_posts = (Post.objects.filter(group=OuterRef("pk")).order_by()
+                   .values("group").annotate(count=Count("pk"))
+                   .values("count"))
+    groups.update(posts_count=Coalesce(Subquery(group_posts), 0))
+
+    author_posts = Post.objects.order_by().values("author")
+    counters = AuthorCounter.objects.all()
+    if author_ids is not None:
+        author_posts = author_posts.filter(author_id__in=author_ids)
+        counters = counters.filter(author_id__in=author_ids)
+    with transaction.atomic():
+        counters.delete()
+        AuthorCounter.objects.bulk_create(
+            (AuthorCounter(author_id=row["author"], posts_count=row["count"])
+             for row in author_posts.annotate(count=Count("pk"))),
+            batch_size=1000,
+        )
+    cache.delete(INDEX_COUNT_KEY)
@@ -0,0 +1,174 @@
+import json
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.db.models import Max
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.views.decorators.http import condition
+
+from .models import Group, Post, User
+
+
+def latest_pub_date(request, slug=None, username=None):
+    """
+    Дата самого свежего поста ленты.
+
+    MAX(pub_date) считается по индексу, сами строки постов не читаются.
+    Результат запоминается на запросе: его спрашивают и для ETag,
+    и для Last-Modified.
+    """
+    if not hasattr(request, "_latest_pub_date"):
+        posts = Post.objects.all()
+        if slug is not None:
+            posts = posts.filter(group__slug=slug)
+        if username is not None:
+            posts = posts.filter(author__username=username)
+        request._latest_pub_date = posts.aggregate(
+            latest=Max("pub_date"))["latest"]
+    return request._latest_pub_date
+
+
+def feed_etag(request, slug=None, username=None):
+    latest = latest_pub_date(request, slug=slug, username=username)
+    if latest is None:
+        return None
+    return f"{request.path}:{latest.timestamp()}"
+
+
+conditional_feed = condition(etag_func=feed_etag,
+                             last_modified_func=latest_pub_date)
+
+
+class IndexFeed(Feed):
+    feed_type = Atom1Feed
+    title = "Yatube: последние обновления"
+    subtitle = "Новые посты на сайте"
+
+    def link(self):
+        return reverse("index")
+
+    def items(self):
+        return Post.objects.for_feed()[:settings.POSTS_FEED_ITEMS]
+
+    def item_title(self, item):
+        return f"@{item.author.username}: {item.text[:50]}"
+
+    def item_description(self, item):
+        return item.text
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+
+class GroupFeed(IndexFeed):
+
+    def get_object(self, request, slug):
+        return get_object_or_404(Group, slug=slug)
+
+    def title(self, group):
+        return f"Yatube: записи сообщества {group.title}"
+
+    def subtitle(self, group):
+        return group.description
+
+    def link(self, group):
+        return reverse("group_posts", kwargs={"slug": group.slug})
+
+    def items(self, group):
+        return (Post.objects.for_feed().filter(group=group)
+                [:settings.POSTS_FEED_ITEMS])
+
+
+class AuthorFeed(IndexFeed):
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, author):
+        return f"Yatube: записи автора {author.get_username()}"
+
+    def subtitle(self, author):
+        return author.get_full_name()
+
+    def link(self, author):
+        return reverse("profile", kwargs={"username": author.username})
+
+    def items(self, author):
+        return (Post.objects.for_feed().filter(author=author)
+                [:settings.POSTS_FEED_ITEMS])
+
+
+def stream_json_feed(request, title, link, feed, items):
+    """JSON Feed 1.1: посты пишутся в ответ по мере чтения из базы."""
+
+    def content():
+        head = json.dumps({
+            "version": "https://jsonfeed.org/version/1.1",
+            "title": title,
+            "home_page_url": request.build_absolute_uri(link),
+            "feed_url": request.build_absolute_uri(),
+        }, ensure_ascii=False)
+        # заголовок закрывается вместе со списком постов в самом конце
+        yield head[:-1] + ', "items": ['
+        for number, post in enumerate(items.iterator()):
+            url = request.build_absolute_uri(post.get_absolute_url())
+            item = {
+                "id": url,
+                "url": url,
+                "title": feed.item_title(post),
+                "content_text": post.text,
+                "date_published": post.pub_date.isoformat(),
+                "authors": [{"name": feed.item_author_name(post)}],
+            }
+            if post.group_id is not None:
+                item["tags"] = [post.group.title]
+            separator = "," if number else ""
+            yield separator + json.dumps(item, ensure_ascii=False)
+        yield "]}"
+
+    return StreamingHttpResponse(content(),
+                                 content_type="application/feed+json")
+
+
+@conditional_feed
+def index_atom(request):
+    return IndexFeed()(request)
+
+
+@conditional_feed
+def index_json(request):
+    feed = IndexFeed()
+    return stream_json_feed(request, feed.title, feed.link(), feed,
+                            feed.items())
+
+
+@conditional_feed
+def group_atom(request, slug):
+    return GroupFeed()(request, slug=slug)
+
+
+@conditional_feed
+def group_json(request, slug):
+    feed = GroupFeed()
+    group = feed.get_object(request, slug)
+    return stream_json_feed(request, feed.title(group), feed.link(group),
+                            feed, feed.items(group))
+
+
+@conditional_feed
+def author_atom(request, username):
+    return AuthorFeed()(request, username=username)
+
+
+@conditional_feed
+def author_json(request, username):
+    feed = AuthorFeed()
+    author = feed.get_object(request, username)
+    return stream_json_feed(request, feed.title(author), feed.link(author),
+                            feed, feed.items(author))
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.contrib.flatpages.models import FlatPage
+from django.contrib.flatpages.views import render_flatpage
+from django.contrib.sites.shortcuts import get_current_site
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+
+from context_processors.year import current_year
+
+from . import versions
+
+
+def flatpage(request, url):
+    """
+    flatpage из django.contrib.flatpages с кешем страницы.
+
+    Анониму готовый HTML отдаётся без запросов к базе и без шаблонов.
+    Вошедшему пользователю страница рендерится заново, потому что в меню
+    его имя, но без запроса FlatPage. Сохранение любой FlatPage меняет
+    версию в ключе; с кешем в памяти процесса другие воркеры увидят
+    правку не позже чем через FLATPAGES_CACHE_TIMEOUT секунд.
+    """
+    site_id = get_current_site(request).id
+    # в подвале год из context_processors.year
+    version = versions.get_versions([versions.FLATPAGES_VERSION])
+    key = f"posts:flatpage:{site_id}:{url}:{version}:{current_year()}"
+    cached = cache.get(key)
+    if cached is None:
+        page = get_object_or_404(FlatPage, url=url, sites=site_id)
+        cached = {"page": page, "content": None}
+        cache.set(key, cached, settings.FLATPAGES_CACHE_TIMEOUT)
+    page = cached["page"]
+    if page.registration_required or request.user.is_authenticated:
+        return render_flatpage(request, page)
+    if cached["content"] is None:
+        response = render_flatpage(request, page)
+        cached["content"] = response.content
+        cache.set(key, cached, settings.FLATPAGES_CACHE_TIMEOUT)
+        return response
+    return HttpResponse(cached["content"])
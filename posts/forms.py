@@ -7,4 +7,4 @@ class PostForm(forms.ModelForm):
 
     class Meta:
         model = Post
-        fields = ("group", "text") #, "image")
+        fields = ("group", "text", "image")
@@ -0,0 +1,152 @@
+"""
+Уменьшенные копии картинок постов.
+
+Копии нарезаются в фоновом пуле потоков после сохранения поста, а их
+ключи в хранилище записываются в Post.image_renditions. Страницы только
+читают готовые ключи и никогда не ждут Pillow: пока копий нет, шаблон
+показывает исходную картинку.
+"""
+import io
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from . import versions
+from .storage import post_image_storage
+
+logger = logging.getLogger(__name__)
+
+# ширина и высота копий, от большей к меньшей
+SIZES = ((960, 339), (480, 170))
+# формат копии: имя для Pillow, расширение файла
+FORMATS = {
+    "webp": ("WEBP", "webp"),
+    "jpeg": ("JPEG", "jpg"),
+}
+QUALITY = 82
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=settings.POSTS_IMAGE_WORKERS,
+                thread_name_prefix="post-images")
+        return _pool
+
+
+def rendition_name(source, width, height, extension):
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return f"posts/renditions/{stem}_{width}x{height}.{extension}"
+
+
+def _encode(image, pillow_format):
+    if pillow_format == "JPEG" and image.mode != "RGB":
+        image = image.convert("RGB")
+    elif image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+    buffer = io.BytesIO()
+    image.save(buffer, pillow_format, quality=QUALITY)
+    return buffer.getvalue()
+
+
+def make_renditions(source, storage=post_image_storage):
+    """Нарезает все размеры и форматы картинки и возвращает их ключи."""
+    with storage.open(source) as original:
+        image = Image.open(original)
+        image.load()
+    sizes = {}
+    for width, height in SIZES:
+        # как crop="center" upscale=True у sorl-thumbnail
+        resized = ImageOps.fit(image, (width, height), Image.LANCZOS)
+        sizes[width] = {
+            name: storage.save(
+                rendition_name(source, width, height, extension),
+                ContentFile(_encode(resized, pillow_format)))
+            for name, (pillow_format, extension) in FORMATS.items()
+        }
+    return {"source": source, "sizes": sizes}
+
+
+def shared_renditions(source):
+    """Готовые копии той же картинки у другого поста, если они есть."""
+    from .models import Post
+
+    # имя картинки — хеш её содержимого, так что совпадение имени
+    # означает совпадение картинки
+    for stored in (Post.objects.filter(image=source)
+                   .exclude(image_renditions="")
+                   .values_list("image_renditions", flat=True)):
+        renditions = json.loads(stored)
+        if renditions.get("source") == source:
+            return renditions
+    return None
+
+
+def render_post_image(post_id, source, reuse=True):
+    """Готовит копии картинки поста и сбрасывает кеш его страниц."""
+    from .models import Post
+
+    renditions = reuse and shared_renditions(source) or None
+    if renditions is None:
+        renditions = make_renditions(source)
+    # пока шла нарезка, картинку поста могли заменить или удалить
+    updated = Post.objects.filter(pk=post_id, image=source).update(
+        image_renditions=json.dumps(renditions), updated=timezone.now())
+    if not updated:
+        return
+    post = Post.objects.only("author", "group").get(pk=post_id)
+    versions.expire_post(post, {post.group_id})
+
+
+def _render_in_worker(post_id, source):
+    try:
+        render_post_image(post_id, source)
+    except Exception:
+        logger.exception("Не удалось нарезать картинку %s", source)
+    finally:
+        # у каждого потока пула своё соединение с базой
+        connection.close()
+
+
+def schedule(post):
+    """Отдаёт картинку поста в пул, как только пост будет сохранён в базе."""
+    post_id, source = post.pk, post.image.name
+    transaction.on_commit(
+        lambda: get_pool().submit(_render_in_worker, post_id, source))
+
+
+def is_referenced(name):
+    """Ссылается ли сейчас хоть один пост на ключ хранилища."""
+    from .models import Post
+
+    return Post.objects.filter(
+        Q(image=name) | Q(image_renditions__contains=f'"{name}"')).exists()
+
+
+def referenced_files():
+    """Все ключи хранилища, на которые ссылаются посты."""
+    from .models import Post
+
+    names = set()
+    rows = (Post.objects.exclude(image="").exclude(image=None)
+            .values_list("image", "image_renditions").iterator())
+    for image, stored in rows:
+        names.add(image)
+        if stored:
+            for keys in json.loads(stored)["sizes"].values():
+                names.update(keys.values())
+    return names
@@ -0,0 +1,117 @@
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.sqlite import apply_pragmas
+
+SCHEMA = (
+    "CREATE TABLE post (id INTEGER PRIMARY KEY, text TEXT NOT NULL, "
+    "pub_date REAL NOT NULL)",
+    "CREATE INDEX post_pub_date_idx ON post (pub_date, id)",
+)
+FEED_PAGE = "SELECT id, text, pub_date FROM post ORDER BY pub_date DESC, " \
+            "id DESC LIMIT 10 OFFSET ?"
+NEW_POST = "INSERT INTO post (text, pub_date) VALUES (?, ?)"
+TEXT = "Пост для замера нагрузки на базу. " * 8
+
+
+def connect(path, pragmas):
+    # как у Django: автокоммит и тайм-аут драйвера в 5 секунд
+    db = sqlite3.connect(path, timeout=5, isolation_level=None,
+                         check_same_thread=False)
+    apply_pragmas(db.cursor(), pragmas)
+    return db
+
+
+class Worker(threading.Thread):
+    def __init__(self, path, pragmas, operation, deadline):
+        super().__init__(daemon=True)
+        self.db = connect(path, pragmas)
+        self.operation = operation
+        self.deadline = deadline
+        self.done = self.locked = 0
+
+    def run(self):
+        while time.monotonic() < self.deadline:
+            try:
+                self.operation(self.db)
+                self.done += 1
+            except sqlite3.OperationalError:
+                # database is locked: ожидание блокировки не помогло
+                self.locked += 1
+        self.db.close()
+
+
+def read_page(db):
+    db.execute(FEED_PAGE, [random.randrange(100) * 10]).fetchall()
+
+
+def write_post(db):
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        db.execute(NEW_POST, [TEXT, time.time()])
+    except sqlite3.Error:
+        db.execute("ROLLBACK")
+        raise
+    db.execute("COMMIT")
+
+
+class Command(BaseCommand):
+    help = ("Сравнивает чтение и запись в SQLite при параллельной нагрузке "
+            "с настройками по умолчанию и с SQLITE_PRODUCTION_PRAGMAS")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seconds", type=float, default=5)
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument("--writers", type=int, default=2)
+        parser.add_argument("--rows", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        modes = (("по умолчанию", {}),
+                 ("продакшен", settings.SQLITE_PRODUCTION_PRAGMAS))
+        results = {}
+        for name, pragmas in modes:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "benchmark.sqlite3")
+                self.seed(path, pragmas, options["rows"])
+                results[name] = self.run(path, pragmas, options)
+            reads, writes, locked = results[name]
+            self.stdout.write(
+                f"{name}: чтений {reads:.0f}/с, записей {writes:.0f}/с, "
+                f"ошибок блокировки {locked}")
+        before, after = results.values()
+        self.stdout.write(self.style.SUCCESS(
+            f"Чтение быстрее в {after[0] / max(before[0], 1):.1f} раза, "
+            f"запись — в {after[1] / max(before[1], 1):.1f} раза"))
+
+    def seed(self, path, pragmas, rows):
+        db = connect(path, pragmas)
+        for statement in SCHEMA:
+            db.execute(statement)
+        db.execute("BEGIN")
+        db.executemany(NEW_POST, ((TEXT, time.time() - i)
+                                  for i in range(rows)))
+        db.execute("COMMIT")
+        db.close()
+
+    def run(self, path, pragmas, options):
+        deadline = time.monotonic() + options["seconds"]
+        readers = [Worker(path, pragmas, read_page, deadline)
+                   for _ in range(options["readers"])]
+        writers = [Worker(path, pragmas, write_post, deadline)
+                   for _ in range(options["writers"])]
+        started = time.monotonic()
+        for worker in readers + writers:
+            worker.start()
+        for worker in readers + writers:
+            worker.join()
+        elapsed = time.monotonic() - started
+        return (sum(worker.done for worker in readers) / elapsed,
+                sum(worker.done for worker in writers) / elapsed,
+                sum(worker.locked for worker in readers + writers))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.templating import parse_times
+
+
+class Command(BaseCommand):
+    help = "Разбирает все шаблоны проекта и показывает время разбора каждого"
+
+    def handle(self, *args, **options):
+        results = parse_times()
+        errors = 0
+        for name, seconds, error in sorted(results, key=lambda row: -row[1]):
+            line = f"{seconds * 1000:8.2f} мс  {name}"
+            if error is not None:
+                errors += 1
+                line += f"  ОШИБКА: {error}"
+            self.stdout.write(line)
+        total = sum(seconds for _, seconds, _ in results)
+        self.stdout.write(f"Всего шаблонов: {len(results)}, "
+                          f"{total * 1000:.2f} мс")
+        if errors:
+            raise CommandError(f"Шаблонов с ошибками: {errors}")
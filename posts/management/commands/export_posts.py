@@ -0,0 +1,40 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+from posts.transfer import FORMATS, guess_format, write_rows
+
+
+class Command(BaseCommand):
+    help = "Выгружает посты в JSONL или CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="файл для выгрузки, - для stdout")
+        parser.add_argument("--format", choices=FORMATS)
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or guess_format(path)
+        rows = (Post.objects.order_by("pk")
+                .values_list("text", "pub_date", "author__username",
+                             "group__slug")
+                .iterator(chunk_size=options["batch_size"]))
+        started = time.monotonic()
+        if path == "-":
+            write_rows(sys.stdout, file_format, self.prepare(rows))
+        else:
+            with open(path, "w", encoding="utf-8", newline="") as stream:
+                write_rows(stream, file_format, self.prepare(rows))
+        elapsed = max(time.monotonic() - started, 1e-9)
+        self.stderr.write(
+            f"Выгружено постов: {self.exported} "
+            f"({self.exported / elapsed:.0f} в секунду)")
+
+    def prepare(self, rows):
+        self.exported = 0
+        for text, pub_date, author, group in rows:
+            self.exported += 1
+            yield text, pub_date.isoformat(), author, group
@@ -0,0 +1,50 @@
+import os
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts.images import is_referenced, referenced_files
+from posts.storage import post_image_storage
+
+
+def walk(storage, path):
+    directories, files = storage.listdir(path)
+    for name in files:
+        yield os.path.join(path, name)
+    for directory in directories:
+        yield from walk(storage, os.path.join(path, directory))
+
+
+class Command(BaseCommand):
+    help = "Удаляет файлы картинок, на которые не ссылается ни один пост"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--min-age", type=int, default=60 * 60,
+                            help="не трогать файлы моложе стольких секунд: "
+                                 "их пост может быть ещё не сохранён")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        storage = post_image_storage
+        if not storage.exists("posts"):
+            return
+        # ссылки читаются до обхода, а перед удалением каждый кандидат
+        # проверяется ещё раз: новый пост мог взять старый файл
+        referenced = referenced_files()
+        threshold = timezone.now() - timedelta(seconds=options["min_age"])
+        removed = freed = 0
+        for name in walk(storage, "posts"):
+            if name in referenced:
+                continue
+            if storage.get_modified_time(name) > threshold:
+                continue
+            if is_referenced(name):
+                continue
+            removed += 1
+            freed += storage.size(name)
+            if not options["dry_run"]:
+                storage.delete(name)
+        verb = "Можно удалить" if options["dry_run"] else "Удалено"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} файлов: {removed} ({freed} байт)"))
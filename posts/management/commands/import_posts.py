@@ -0,0 +1,97 @@
+import itertools
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from posts import counters, versions
+from posts.models import Group, Post, User
+from posts.transfer import (FORMATS, guess_format, insert_posts,
+                            parse_pub_date, read_rows)
+
+
+class Command(BaseCommand):
+    help = "Загружает посты из JSONL или CSV пачками"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="файл с постами, - для stdin")
+        parser.add_argument("--format", choices=FORMATS)
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        batch_size = options["batch_size"]
+        file_format = options["format"] or guess_format(path)
+        self.authors = {}
+        self.groups = {}
+        self.imported = 0
+        self.skipped = 0
+        started = time.monotonic()
+        try:
+            if path == "-":
+                self.load(sys.stdin, file_format, batch_size)
+            else:
+                with open(path, encoding="utf-8", newline="") as stream:
+                    self.load(stream, file_format, batch_size)
+        finally:
+            # пачки до ошибки уже в базе: счётчики и ленты должны их учесть
+            self.finish()
+        elapsed = max(time.monotonic() - started, 1e-9)
+        self.stdout.write(self.style.SUCCESS(
+            f"Загружено постов: {self.imported}, пропущено: {self.skipped} "
+            f"({self.imported / elapsed:.0f} в секунду)"))
+
+    def load(self, stream, file_format, batch_size):
+        rows = read_rows(stream, file_format)
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            posts = self.build(batch)
+            with transaction.atomic():
+                insert_posts(posts, batch_size=batch_size)
+            self.imported += len(posts)
+
+    def build(self, batch):
+        self.resolve(User, "username", self.authors,
+                     {row.get("author") for row in batch})
+        self.resolve(Group, "slug", self.groups,
+                     {row.get("group") for row in batch})
+        posts = []
+        for number, row in enumerate(batch, self.imported + self.skipped + 1):
+            author_id = self.authors.get(row.get("author"))
+            group_id = self.groups.get(row.get("group"))
+            if author_id is None or (row.get("group") and group_id is None):
+                self.skipped += 1
+                self.stderr.write(f"Строка {number}: нет автора или группы")
+                continue
+            try:
+                pub_date = parse_pub_date(row.get("pub_date"))
+            except ValueError as error:
+                raise CommandError(f"Строка {number}: {error}")
+            posts.append(Post(text=row.get("text", ""), pub_date=pub_date,
+                              author_id=author_id, group_id=group_id))
+        return posts
+
+    def resolve(self, model, field, lookup, values):
+        """Дозагружает в таблицу поиска id ещё не встречавшихся значений."""
+        missing = {value for value in values
+                   if value and value not in lookup}
+        if not missing:
+            return
+        found = model.objects.filter(**{f"{field}__in": missing})
+        lookup.update(found.values_list(field, "pk"))
+        # не найденные тоже запоминаем, чтобы не искать их снова
+        lookup.update(dict.fromkeys(missing - lookup.keys()))
+
+    def finish(self):
+        # вставка пачками не шлёт сигналов: счётчики и версии лент обновляем сами
+        author_ids = {pk for pk in self.authors.values() if pk is not None}
+        group_ids = {pk for pk in self.groups.values() if pk is not None}
+        counters.recount(author_ids=author_ids, group_ids=group_ids)
+        versions.bump(
+            versions.feed_key(),
+            *(versions.feed_key(author_id=pk) for pk in author_ids),
+            *(versions.feed_key(group_id=pk) for pk in group_ids),
+        )
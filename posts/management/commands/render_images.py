@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from posts.images import render_post_image
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = "Нарезает копии картинок постов, у которых их ещё нет"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true",
+                            help="нарезать заново и уже готовые копии")
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image="").exclude(image=None)
+        rendered = 0
+        for post in posts.only("image", "image_renditions").iterator():
+            if post.renditions and not options["all"]:
+                continue
+            render_post_image(post.pk, post.image.name,
+                              reuse=not options["all"])
+            rendered += 1
+        self.stdout.write(self.style.SUCCESS(
+            f"Нарезаны картинки постов: {rendered}"))
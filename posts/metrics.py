@@ -0,0 +1,154 @@
+"""
+Замеры запросов: число SQL-запросов, время в базе, время рендера
+шаблонов, время каждого контекст-процессора и полное время ответа
+по имени URL.
+
+Замеры копятся в гистограммах в памяти процесса и отдаются
+представлением request_metrics, а по каждому ответу — заголовком
+Server-Timing.
+"""
+import bisect
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+# верхние границы корзин: миллисекунды для времени и штуки для запросов
+BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+METRICS = ("queries", "sql", "template", "total")
+
+_local = threading.local()
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0
+        self.lock = threading.Lock()
+
+    def add(self, value):
+        index = bisect.bisect_left(BUCKETS, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def quantile(self, q):
+        """Верхняя граница корзины, в которую попадает квантиль q."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS + (float("inf"),), self.counts):
+            seen += count
+            if count and seen >= rank:
+                return bound
+        return 0
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "count": self.count,
+                "sum": round(self.sum, 3),
+                "p50": self.quantile(0.5),
+                "p95": self.quantile(0.95),
+                "p99": self.quantile(0.99),
+                "buckets": dict(zip([str(bound) for bound in BUCKETS]
+                                    + ["inf"], self.counts)),
+            }
+
+
+class Registry:
+    def __init__(self):
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def histogram(self, url_name, metric):
+        key = (url_name, metric)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(key, Histogram())
+        return histogram
+
+    def record(self, url_name, timings):
+        for metric in METRICS:
+            self.histogram(url_name, metric).add(getattr(timings, metric))
+        # процессор, который шаблоны не читали, не запускался и не замерен
+        for name, value in timings.processors.items():
+            self.histogram(url_name, f"context:{name}").add(value)
+
+    def snapshot(self):
+        result = {}
+        for (url_name, metric), histogram in sorted(self.histograms.items()):
+            result.setdefault(url_name, {})[metric] = histogram.snapshot()
+        return result
+
+    def clear(self):
+        with self.lock:
+            self.histograms.clear()
+
+
+registry = Registry()
+
+
+class Timings:
+    """Замеры одного запроса, время в миллисекундах."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql = 0
+        self.template = 0
+        self.total = 0
+        # путь контекст-процессора -> время
+        self.processors = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        # обёртка connection.execute_wrapper вокруг каждого SQL-запроса
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql += (time.perf_counter() - started) * 1000
+
+    def server_timing(self):
+        return (f'sql;dur={self.sql:.1f};desc="{self.queries} queries", '
+                f"tpl;dur={self.template:.1f}, "
+                f"total;dur={self.total:.1f}")
+
+
+def add_template_time(seconds):
+    timings = getattr(_local, "timings", None)
+    if timings is not None:
+        timings.template += seconds * 1000
+
+
+def add_processor_time(name, seconds):
+    timings = getattr(_local, "timings", None)
+    if timings is not None:
+        timings.processors[name] = (timings.processors.get(name, 0)
+                                    + seconds * 1000)
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = _local.timings = Timings()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings))
+                response = self.get_response(request)
+        finally:
+            _local.timings = None
+        timings.total = (time.perf_counter() - started) * 1000
+        match = request.resolver_match
+        registry.record(match.view_name if match else "unresolved", timings)
+        if settings.POSTS_SERVER_TIMING:
+            response["Server-Timing"] = timings.server_timing()
+        return response
@@ -0,0 +1,24 @@
+# Generated by Django 2.2.6 on 2026-10-18 18:28
+
+from django.db import migrations, models
+
+
+def updated_from_pub_date(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Post.objects.update(updated=models.F('pub_date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, verbose_name='дата изменения'),
+        ),
+        migrations.RunPython(updated_from_pub_date, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,10 @@
+import json
+
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.urls import reverse
+
+from .storage import post_image_storage
 
 
 User = get_user_model()
@@ -9,6 +14,8 @@ class Group(models.Model):
     title = models.CharField("название группы", max_length=200)
     slug = models.SlugField("слэг", unique=True)
     description = models.TextField("описание группы")
+    posts_count = models.PositiveIntegerField("количество постов", default=0,
+                                              editable=False)
 
     class Meta:
         verbose_name = "Группа"
@@ -18,9 +25,27 @@ class Group(models.Model):
         return self.title
 
 
+class PostQuerySet(models.QuerySet):
+    FEED_FIELDS = (
+        "text", "pub_date", "updated", "author", "group",
+        "author__username", "author__first_name", "author__last_name",
+        "group__slug", "group__title", "image", "image_renditions",
+    )
+
+    def for_feed(self):
+        """Посты вместе с авторами и группами одним запросом."""
+        return self.select_related("author", "group").only(*self.FEED_FIELDS)
+
+    def of_author(self, username, post_id):
+        """Пост автора одним запросом: с автором, его счётчиком и группой."""
+        return self.select_related("author__post_counter", "group").filter(
+            pk=post_id, author__username=username)
+
+
 class Post(models.Model):
     text = models.TextField("ваш пост", help_text="напишите свой пост здесь")
     pub_date = models.DateTimeField("дата публикации", auto_now_add=True)
+    updated = models.DateTimeField("дата изменения", auto_now=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE,
                                related_name="posts",
                                verbose_name="автор поста",
@@ -29,12 +54,65 @@ class Post(models.Model):
                               related_name="posts", blank=True, null=True,
                               verbose_name="группа поста",
                               help_text="выберите группу из списка")
-    #image = models.ImageField(upload_to='posts/', blank=True, null=True)
+    image = models.ImageField("картинка", upload_to="posts/", blank=True,
+                              null=True, storage=post_image_storage)
+    # ключи уменьшенных копий картинки, их готовит posts.images
+    image_renditions = models.TextField(blank=True, default="",
+                                        editable=False)
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Пост"
         verbose_name_plural = "Посты"
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(fields=['pub_date', 'id'],
+                         name='post_pub_date_idx'),
+            models.Index(fields=['group', 'pub_date'],
+                         name='post_group_pub_date_idx'),
+            models.Index(fields=['author', 'pub_date'],
+                         name='post_author_pub_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.text[:15], self.pub_date, self.author, self.group}"
+
+    def get_absolute_url(self):
+        return reverse("post", kwargs={"username": self.author.username,
+                                       "post_id": self.pk})
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # группа, с которой пост лежит в базе: нужна счётчикам лент
+        instance._loaded_group_id = instance.__dict__.get("group_id")
+        if "image" in instance.__dict__:
+            instance._loaded_image = instance.__dict__["image"]
+        return instance
+
+    @property
+    def renditions(self):
+        """Копии текущей картинки по ширине: {960: {"jpeg": ключ, ...}}."""
+        if not self.image or not self.image_renditions:
+            return {}
+        stored = json.loads(self.image_renditions)
+        # копии прежней картинки, пока новая ещё нарезается, не годятся
+        if stored.get("source") != self.image.name:
+            return {}
+        return {int(width): keys for width, keys in stored["sizes"].items()}
+
+
+class AuthorCounter(models.Model):
+    author = models.OneToOneField(User, on_delete=models.CASCADE,
+                                  primary_key=True,
+                                  related_name="post_counter",
+                                  verbose_name="автор")
+    posts_count = models.PositiveIntegerField("количество постов", default=0)
+
+    class Meta:
+        verbose_name = "Счётчик постов автора"
+        verbose_name_plural = "Счётчики постов авторов"
+
+    def __str__(self):
+        return f"{self.author}: {self.posts_count}"
@@ -0,0 +1,141 @@
+import base64
+import binascii
+import collections.abc
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(post):
+    raw = f"{post.pub_date.isoformat()}|{post.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    padded = token + "=" * (-len(token) % 4)
+    try:
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        pub_date, pk = raw.split("|")
+        return datetime.fromisoformat(pub_date), int(pk)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise InvalidCursor(token)
+
+
+class CursorPage(collections.abc.Sequence):
+    """
+    Страница ленты, полученная по курсору, а не по номеру.
+
+    Посты выбираются при первом обращении к странице: потоковый ответ
+    успевает отдать шапку до запроса.
+    """
+
+    def __init__(self, paginator, after=None, before=None):
+        self.paginator = paginator
+        self.after = after
+        self.before = before
+        # битый курсор обнаруживается сразу, запрос для этого не нужен
+        self.queryset = paginator.seek(after=after, before=before)
+
+    def __repr__(self):
+        return "<CursorPage>"
+
+    @cached_property
+    def _fetched(self):
+        """(посты, есть ли следующая, есть ли предыдущая)."""
+        per_page = self.paginator.per_page
+        posts = list(self.queryset[:per_page + 1])
+        if not posts and (self.after or self.before):
+            # курсор за краем ленты, например хвост ленты удалили
+            self.after = self.before = None
+            posts = list(self.paginator.seek()[:per_page + 1])
+        has_more = len(posts) > per_page
+        posts = posts[:per_page]
+        if self.before:
+            posts.reverse()
+            return posts, bool(posts), has_more
+        return posts, has_more, bool(self.after and posts)
+
+    @property
+    def object_list(self):
+        return self._fetched[0]
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._fetched[1]
+
+    def has_previous(self):
+        return self._fetched[2]
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @cached_property
+    def next_cursor(self):
+        if not self.has_next() or not self.object_list:
+            return None
+        return encode_cursor(self.object_list[-1])
+
+    @cached_property
+    def previous_cursor(self):
+        if not self.has_previous() or not self.object_list:
+            return None
+        return encode_cursor(self.object_list[0])
+
+
+class CursorPaginator:
+    """
+    Пагинация по ключу (pub_date, id) вместо OFFSET.
+
+    Каждая страница — это поиск по индексу от позиции курсора, поэтому
+    глубина страницы не влияет на стоимость запроса, а COUNT(*) не нужен.
+    """
+
+    is_cursor = True
+
+    def __init__(self, object_list, per_page, count=None):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        # функция счётчика ленты; зовётся, только если итог кому-то нужен
+        self.count_func = count
+
+    @cached_property
+    def count(self):
+        if self.count_func is not None:
+            return self.count_func()
+        return self.object_list.count()
+
+    def seek(self, after=None, before=None):
+        """Посты, идущие за курсором, в порядке чтения от него."""
+        queryset = self.object_list
+        if before:
+            pub_date, pk = decode_cursor(before)
+            # pub_date__gte отдельным условием даёт поиск по индексу
+            return queryset.filter(pub_date__gte=pub_date).filter(
+                Q(pub_date__gt=pub_date) | Q(pk__gt=pk)
+            ).order_by("pub_date", "pk")
+        if after:
+            pub_date, pk = decode_cursor(after)
+            queryset = queryset.filter(pub_date__lte=pub_date).filter(
+                Q(pub_date__lt=pub_date) | Q(pk__lt=pk)
+            )
+        return queryset.order_by("-pub_date", "-pk")
+
+    def page(self, after=None, before=None):
+        return CursorPage(self, after=after, before=before)
+
+    def get_page(self, after=None, before=None):
+        """Как Paginator.get_page: битый курсор ведёт на первую страницу."""
+        try:
+            return self.page(after=after, before=before)
+        except InvalidCursor:
+            return self.page()
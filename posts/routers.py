@@ -0,0 +1,94 @@
+"""
+Чтение лент с реплик базы.
+
+Представления, помеченные replica_reads, читают посты и пользователей
+с одной из баз DATABASE_REPLICAS. Всё остальное, а также любые записи,
+идёт в основную базу. Пользователь, который только что что-то записал,
+DATABASE_REPLICA_LAG секунд читает с основной базы, чтобы сразу увидеть
+свою правку, даже если реплика ещё отстаёт.
+
+Вошедший пользователь запроса и его права всегда читаются с основной
+базы: на отставшей реплике у него может оказаться старый пароль или ещё
+не снятая блокировка.
+"""
+import random
+import threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# кука «читать с основной базы», её ставит любой изменяющий запрос
+PIN_COOKIE = "db_primary"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_state = threading.local()
+
+
+def replica_reads(view):
+    """Помечает представление, которое только читает посты и авторов."""
+    view.replica_reads = True
+    return view
+
+
+def current_replica():
+    return getattr(_state, "replica", None)
+
+
+def use_replica(alias=None):
+    _state.replica = alias or random.choice(settings.DATABASE_REPLICAS)
+
+
+def use_primary():
+    _state.replica = None
+
+
+class ReplicaRouter:
+    app_labels = {"posts"}
+
+    def routed(self, model):
+        # пользователи живут в auth, а не в users; права и группы auth
+        # с реплики не читаются
+        return (model._meta.app_label in self.app_labels
+                or model._meta.label == settings.AUTH_USER_MODEL)
+
+    def db_for_read(self, model, **hints):
+        if self.routed(model):
+            return current_replica()
+        return None
+
+    def db_for_write(self, model, **hints):
+        # без явного ответа Django пишет туда, откуда объект прочитан,
+        # то есть в реплику
+        if self.routed(model):
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # все базы проекта — копии одних и тех же данных
+        if self.routed(obj1._meta.model) or self.routed(obj2._meta.model):
+            return True
+        return None
+
+
+class ReplicaMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            use_primary()
+        if settings.DATABASE_REPLICAS and request.method not in SAFE_METHODS:
+            response.set_cookie(PIN_COOKIE, "1", httponly=True,
+                                max_age=settings.DATABASE_REPLICA_LAG)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (settings.DATABASE_REPLICAS
+                and getattr(view_func, "replica_reads", False)
+                and request.method in SAFE_METHODS
+                and PIN_COOKIE not in request.COOKIES):
+            # request.user ленивый: загружаем его до переключения на реплику
+            request.user.is_authenticated
+            use_replica()
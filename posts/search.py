@@ -0,0 +1,92 @@
+import re
+
+from django.db import connection, connections
+
+# словарь PostgreSQL, по которому построен GIN-индекс в миграции 0011
+POSTGRESQL_CONFIG = "russian"
+
+SQLITE_TRIGGERS = {
+    "posts_post_fts_ai": (
+        "CREATE TRIGGER posts_post_fts_ai AFTER INSERT ON posts_post BEGIN "
+        "INSERT INTO posts_post_fts(rowid, text) VALUES (new.id, new.text); "
+        "END"
+    ),
+    "posts_post_fts_ad": (
+        "CREATE TRIGGER posts_post_fts_ad AFTER DELETE ON posts_post BEGIN "
+        "INSERT INTO posts_post_fts(posts_post_fts, rowid, text) "
+        "VALUES ('delete', old.id, old.text); "
+        "END"
+    ),
+    "posts_post_fts_au": (
+        "CREATE TRIGGER posts_post_fts_au AFTER UPDATE OF text ON posts_post "
+        "BEGIN "
+        "INSERT INTO posts_post_fts(posts_post_fts, rowid, text) "
+        "VALUES ('delete', old.id, old.text); "
+        "INSERT INTO posts_post_fts(rowid, text) VALUES (new.id, new.text); "
+        "END"
+    ),
+}
+
+
+def ensure_search_index(using):
+    """
+    Возвращает на место триггеры FTS5, если миграция их потеряла.
+
+    SQLite меняет схему posts_post, пересоздавая таблицу, и триггеры
+    при этом удаляются. Без них индекс отстаёт, поэтому после миграций
+    недостающие триггеры создаются заново, а индекс перестраивается.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT type, name FROM sqlite_master WHERE name LIKE %s",
+            ["posts_post_fts%"],
+        )
+        existing = {name for kind, name in cursor.fetchall()}
+        if "posts_post_fts" not in existing:
+            return
+        missing = SQLITE_TRIGGERS.keys() - existing
+        for name in sorted(missing):
+            cursor.execute(SQLITE_TRIGGERS[name])
+        if missing:
+            cursor.execute(
+                "INSERT INTO posts_post_fts(posts_post_fts) "
+                "VALUES ('rebuild')")
+
+
+def fts5_query(query):
+    """Слова запроса как префиксы: все должны встретиться в посте."""
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", query))
+
+
+def search_posts(queryset, query):
+    """
+    Посты, подходящие под запрос, от самых релевантных.
+
+    Ищет по полнотекстовому индексу: FTS5 в SQLite, GIN по tsvector
+    в PostgreSQL. На других базах падает обратно на LIKE.
+    """
+    if not re.search(r"\w", query):
+        return queryset.none()
+    if connection.vendor == "sqlite":
+        return queryset.extra(
+            tables=["posts_post_fts"],
+            where=["posts_post_fts.rowid = posts_post.id",
+                   "posts_post_fts MATCH %s"],
+            params=[fts5_query(query)],
+            select={"rank": "posts_post_fts.rank"},
+            order_by=["rank", "-pub_date"],
+        )
+    if connection.vendor == "postgresql":
+        vector = f"to_tsvector('{POSTGRESQL_CONFIG}', posts_post.text)"
+        tsquery = f"plainto_tsquery('{POSTGRESQL_CONFIG}', %s)"
+        return queryset.extra(
+            where=[f"{vector} @@ {tsquery}"],
+            params=[query],
+            select={"rank": f"ts_rank({vector}, {tsquery})"},
+            select_params=[query],
+            order_by=["-rank", "-pub_date"],
+        )
+    return queryset.filter(text__icontains=query)
@@ -0,0 +1,101 @@
+from django.contrib.auth.signals import user_logged_out
+from django.contrib.flatpages.models import FlatPage
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_save)
+from django.dispatch import receiver
+
+from . import auth, counters, images, versions
+from .search import ensure_search_index
+from .models import Group, Post, User
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, **kwargs):
+    old_group_id = getattr(instance, "_loaded_group_id", instance.group_id)
+    if created:
+        counters.adjust_index_count(1)
+        counters.adjust_author_count(instance.author_id, 1)
+        counters.adjust_group_count(instance.group_id, 1)
+    elif old_group_id != instance.group_id:
+        counters.adjust_group_count(old_group_id, -1)
+        counters.adjust_group_count(instance.group_id, 1)
+    versions.expire_post(instance, {old_group_id, instance.group_id})
+    instance._loaded_group_id = instance.group_id
+    old_image = getattr(instance, "_loaded_image", instance.image.name)
+    if instance.image and (created or old_image != instance.image.name):
+        images.schedule(instance)
+    instance._loaded_image = instance.image.name
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    group_id = getattr(instance, "_loaded_group_id", instance.group_id)
+    counters.adjust_index_count(-1)
+    counters.adjust_author_count(instance.author_id, -1)
+    counters.adjust_group_count(group_id, -1)
+    versions.expire_post(instance, {group_id})
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_changed(sender, instance, **kwargs):
+    versions.bump(versions.group_key(instance.pk), versions.feed_key(),
+                  versions.feed_key(group_id=instance.pk),
+                  versions.GROUPS_VERSION)
+
+
+# поля автора, которые видны в карточках и лентах
+AUTHOR_FIELDS = ("username", "first_name", "last_name")
+
+
+@receiver(pre_save, sender=User)
+def remember_author(sender, instance, using, update_fields=None, **kwargs):
+    if instance._state.adding:
+        return
+    if update_fields and not set(update_fields) & set(AUTHOR_FIELDS):
+        return
+    instance._saved_author = (User.objects.using(using)
+                              .filter(pk=instance.pk)
+                              .values_list(*AUTHOR_FIELDS).first())
+
+
+@receiver(post_save, sender=User)
+def author_changed(sender, instance, created, **kwargs):
+    # у нового пользователя ещё нет постов ни на одной странице
+    saved = instance.__dict__.pop("_saved_author", None)
+    if created or saved is None:
+        return
+    if saved != tuple(getattr(instance, name) for name in AUTHOR_FIELDS):
+        versions.bump(versions.author_key(instance.pk),
+                      versions.AUTHORS_VERSION)
+
+
+@receiver(post_delete, sender=User)
+def author_deleted(sender, instance, **kwargs):
+    versions.bump(versions.author_key(instance.pk), versions.AUTHORS_VERSION)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    # и last_login, и смена пароля: вошедший пользователь берётся из кеша
+    auth.forget_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def user_left(sender, request, user, **kwargs):
+    if user is not None:
+        auth.forget_user(user.pk)
+
+
+@receiver(post_save, sender=FlatPage)
+@receiver(post_delete, sender=FlatPage)
+@receiver(m2m_changed, sender=FlatPage.sites.through)
+def flatpage_changed(sender, **kwargs):
+    # страниц мало и меняются они редко: проще сбросить все разом,
+    # чем следить за сменой адреса
+    versions.bump(versions.FLATPAGES_VERSION)
+
+
+def restore_search_index(sender, using, **kwargs):
+    ensure_search_index(using)
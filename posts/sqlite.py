@@ -0,0 +1,22 @@
+from django.conf import settings
+
+
+def apply_pragmas(cursor, pragmas):
+    """Выполняет PRAGMA из словаря {имя: значение} на соединении SQLite."""
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def tune_connection(sender, connection, **kwargs):
+    """
+    Настраивает каждое новое соединение с SQLite по SQLITE_PRAGMAS.
+
+    В режиме WAL читатели не ждут пишущего, а synchronous=NORMAL
+    не вызывает fsync на каждую транзакцию. PRAGMA действуют только
+    на своё соединение, поэтому выполняются при каждом подключении;
+    CONN_MAX_AGE не даёт платить за это на каждый запрос.
+    """
+    if connection.vendor != "sqlite" or not settings.SQLITE_PRAGMAS:
+        return
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, settings.SQLITE_PRAGMAS)
@@ -0,0 +1,160 @@
+"""
+Статика для продакшена.
+
+collectstatic с CompressedManifestStaticFilesStorage кладёт в STATIC_ROOT
+файлы с хешем содержимого в имени и рядом с ними их сжатые копии .gz
+и, если установлен пакет brotli, .br. StaticFilesMiddleware отдаёт
+из STATIC_ROOT копию в лучшей кодировке, которую принимает клиент.
+Файлам с хешем в имени ставится кеширование на год: при любой правке
+у файла меняется адрес.
+"""
+import gzip
+import mimetypes
+import os
+import posixpath
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import (ManifestStaticFilesStorage,
+                                                staticfiles_storage)
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# сжимаются только текстовые форматы: картинки и шрифты уже сжаты
+COMPRESSIBLE = (".css", ".js", ".map", ".svg", ".txt", ".html", ".json",
+                ".xml", ".ico")
+# кодировка -> расширение сжатой копии, в порядке предпочтения
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def compress(data):
+    """Сжатые копии данных: [(расширение, байты)], только если они меньше."""
+    variants = [(".gz", gzip.compress(data, 9, mtime=0))]
+    if brotli is not None:
+        variants.append((".br", brotli.compress(data)))
+    return [(suffix, body) for suffix, body in variants
+            if len(body) < len(data)]
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хеш в именах файлов и сжатые копии рядом с ними."""
+
+    # файла может не быть в собранной статике: библиотеки вроде bootstrap
+    # не лежат в репозитории. Строгий манифест ронял бы с 500-й любую
+    # страницу с {% static %} на такой файл, а так битой будет лишь ссылка
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # без манифеста Django пытается посчитать хеш сам и падает,
+            # если файла нет на диске
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        # и исходные имена, и имена с хешем: на исходные могут ссылаться
+        # файлы, которые собраны не через {% static %}
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if not name.endswith(COMPRESSIBLE) or not self.exists(name):
+                continue
+            with self.open(name) as source:
+                data = source.read()
+            for suffix, body in compress(data):
+                with open(self.path(name + suffix), "wb") as target:
+                    target.write(body)
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding, которые клиент не запретил через q=0."""
+    accepted = set()
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+class StaticFilesMiddleware:
+    """
+    Отдаёт собранную статику без представлений и без базы.
+
+    Включается настройкой STATIC_SERVE, когда перед Django нет веб-сервера,
+    который отдавал бы STATIC_ROOT сам.
+    """
+
+    def __init__(self, get_response):
+        if not settings.STATIC_SERVE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+        # манифест читается один раз: статика собирается до старта воркеров
+        self.immutable = set(
+            getattr(staticfiles_storage, "hashed_files", {}).values())
+
+    def __call__(self, request):
+        if request.path_info.startswith(self.prefix):
+            response = self.serve(request,
+                                  request.path_info[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, name):
+        if request.method not in ("GET", "HEAD"):
+            return None
+        name = posixpath.normpath(unquote(name)).lstrip("/")
+        try:
+            path = safe_join(settings.STATIC_ROOT, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+        accepted = accepted_encodings(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        encoding = None
+        for coding, suffix in ENCODINGS:
+            if coding in accepted and os.path.isfile(path + suffix):
+                encoding, path = coding, path + suffix
+                break
+        stat = os.stat(path)
+        if not was_modified_since(request.META.get("HTTP_IF_MODIFIED_SINCE"),
+                                  stat.st_mtime, stat.st_size):
+            response = HttpResponseNotModified()
+        else:
+            content_type = (mimetypes.guess_type(name)[0]
+                            or "application/octet-stream")
+            response = FileResponse(open(path, "rb"),
+                                    content_type=content_type)
+            response["Content-Length"] = stat.st_size
+            if encoding:
+                response["Content-Encoding"] = encoding
+        response["Last-Modified"] = http_date(stat.st_mtime)
+        response["Vary"] = "Accept-Encoding"
+        response["Cache-Control"] = self.cache_control(name)
+        return response
+
+    def cache_control(self, name):
+        if name in self.immutable:
+            return (f"public, max-age={settings.STATIC_IMMUTABLE_MAX_AGE}, "
+                    "immutable")
+        # у файла без хеша адрес не меняется при правке
+        return f"public, max-age={settings.STATIC_MAX_AGE}"
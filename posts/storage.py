@@ -0,0 +1,39 @@
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Хранилище, где имя файла — хеш его содержимого.
+
+    Одинаковые загрузки ложатся в один и тот же файл, поэтому повторная
+    картинка не занимает места на диске, а её копии не нужно нарезать
+    заново. Файлы, на которые больше никто не ссылается, удаляет
+    команда gc_images.
+    """
+
+    def hashed_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        digest = digest.hexdigest()
+        extension = os.path.splitext(name)[1].lower()
+        return os.path.join(os.path.dirname(name), digest[:2],
+                            digest + extension)
+
+    def _save(self, name, content):
+        name = self.hashed_name(name, content)
+        if self.exists(name):
+            # свежий mtime не даёт gc_images удалить файл, на который
+            # вот-вот сошлётся новый пост
+            os.utime(self.path(name))
+            return name
+        return super()._save(name, content)
+
+
+post_image_storage = ContentAddressedStorage()
@@ -0,0 +1,87 @@
+"""
+Потоковый ответ для лент.
+
+Страница ленты рендерится сразу, но вместо постов и навигации по страницам
+в ней стоит метка. Всё до метки уходит клиенту первым куском, затем
+карточки постов по одной, по мере того как их отдаёт итератор запроса,
+и в конце — навигация и всё после метки. Навигация рендерится после
+карточек: страница по курсору узнаёт, есть ли следующая, только выбрав
+посты. Так запрос постов выполняется уже после того, как клиент получил
+шапку и меню, в обоих режимах пагинации.
+"""
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.template.loader import get_template, render_to_string
+from django.utils.safestring import mark_safe
+
+from .routers import current_replica, use_primary, use_replica
+from .templating import make_context
+
+# пользовательский текст экранируется, поэтому комментарий в нём не встретится
+POSTS_SLOT = mark_safe("<!-- posts -->")
+# навигация по страницам, которая в потоковом ответе идёт после карточек
+NAV_TEMPLATE = "paginator.html"
+
+
+def page_posts(page):
+    """Посты страницы; QuerySet читается итератором, без кеша результатов."""
+    object_list = page.object_list
+    if hasattr(object_list, "iterator"):
+        return object_list.iterator()
+    return iter(object_list)
+
+
+def render_cards(request, context, card_template, replica):
+    # генератор работает уже после ReplicaMiddleware, выбор базы
+    # представления восстанавливается на время чтения постов
+    if replica is not None:
+        use_replica(replica)
+    try:
+        card = get_template(card_template).template
+        card_context = make_context(context, request)
+        with card_context.bind_template(card):
+            for counter, post in enumerate(page_posts(context["page"]), 1):
+                forloop = {"counter": counter, "first": counter == 1}
+                with card_context.push(post=post, forloop=forloop):
+                    yield card.render(card_context)
+    finally:
+        use_primary()
+
+
+def stream_page(head, cards, tail, cache_key, timeout):
+    """tail — функция, которая рендерит конец страницы после карточек."""
+    yield head
+    parts = [head]
+    for card in cards:
+        parts.append(card)
+        yield card
+    tail = tail()
+    yield tail
+    # в кеш попадает только страница, отданная целиком
+    if cache_key is not None:
+        parts.append(tail)
+        cache.set(cache_key, "".join(parts).encode(), timeout)
+
+
+def stream_feed(request, template_name, context, card_template,
+                cache_key=None, timeout=None):
+    """
+    StreamingHttpResponse для ленты с карточками из card_template.
+
+    В шаблоне ленты на месте карточек и навигации по страницам должна
+    стоять метка {{ posts_slot }}; без неё страница отдаётся обычным
+    ответом. Если задан cache_key, собранная
+    страница кладётся в кеш так же, как в render_feed.
+    """
+    shell = render_to_string(template_name,
+                             dict(context, posts_slot=POSTS_SLOT), request)
+    head, slot, tail = shell.partition(POSTS_SLOT)
+    if not slot:
+        return HttpResponse(shell)
+    cards = render_cards(request, context, card_template, current_replica())
+
+    def render_tail():
+        return render_to_string(NAV_TEMPLATE, context, request) + tail
+
+    return StreamingHttpResponse(
+        stream_page(head, cards, render_tail, cache_key, timeout))
@@ -0,0 +1,32 @@
+from django import template
+
+from posts.images import SIZES
+
+register = template.Library()
+
+SIZES_ATTRIBUTE = f"(max-width: {SIZES[0][0]}px) 100vw, {SIZES[0][0]}px"
+
+
+def _srcset(storage, renditions, name):
+    return ", ".join(f"{storage.url(keys[name])} {width}w"
+                     for width, keys in sorted(renditions.items()))
+
+
+@register.inclusion_tag("includes/post_image.html")
+def post_image(post):
+    """Картинка поста с srcset из готовых копий или исходник, пока их нет."""
+    if not post.image:
+        return {}
+    renditions = post.renditions
+    if not renditions:
+        return {"src": post.image.url}
+    storage = post.image.storage
+    width, height = SIZES[0]
+    return {
+        "src": storage.url(renditions[width]["jpeg"]),
+        "width": width,
+        "height": height,
+        "srcset": _srcset(storage, renditions, "jpeg"),
+        "webp_srcset": _srcset(storage, renditions, "webp"),
+        "sizes": SIZES_ATTRIBUTE,
+    }
@@ -0,0 +1,10 @@
+from django import template
+
+from posts.versions import post_card_version
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_version(post):
+    return post_card_version(post)
@@ -0,0 +1,240 @@
+import os
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.backends import django as django_backend
+from django.template.base import Origin
+from django.template.base import Template as CompiledTemplate
+from django.template.context import Context, RequestContext
+
+from . import metrics
+
+
+# ключи встроенных процессоров Django, которые не объявлены через provides
+BUILTIN_CONTEXT_KEYS = {
+    "django.template.context_processors.debug": ("debug", "sql_queries"),
+    "django.template.context_processors.request": ("request",),
+    "django.contrib.auth.context_processors.auth": ("user", "perms"),
+    "django.contrib.messages.context_processors.messages": (
+        "messages", "DEFAULT_MESSAGE_LEVELS"),
+}
+
+
+def processor_name(processor):
+    return f"{processor.__module__}.{processor.__qualname__}"
+
+
+def context_keys(processor):
+    """Ключи процессора или None, если они неизвестны заранее."""
+    keys = getattr(processor, "context_keys", None)
+    if keys is None:
+        keys = BUILTIN_CONTEXT_KEYS.get(processor_name(processor))
+    return keys
+
+
+class ProcessorContext:
+    """
+    Вывод контекст-процессоров для RequestContext.
+
+    Процессор с известными ключами вызывается при первом чтении любого
+    из них, поэтому страница, где его значения не нужны, не платит
+    за него. Процессоры без объявленных ключей вызываются сразу, как
+    в Django. Время каждого вызова попадает в posts.metrics.
+    """
+
+    def __init__(self, request, processors):
+        self.request = request
+        self.values = {}
+        self.pending = {}
+        for processor in processors:
+            keys = context_keys(processor)
+            if keys is None:
+                output = self.run(processor)
+                for key in output:
+                    self.pending.pop(key, None)
+                self.values.update(output)
+            else:
+                # как в Django: более поздний процессор перекрывает ключ
+                for key in keys:
+                    self.values.pop(key, None)
+                    self.pending[key] = processor
+
+    def run(self, processor):
+        started = time.perf_counter()
+        try:
+            return processor(self.request)
+        finally:
+            metrics.add_processor_time(processor_name(processor),
+                                       time.perf_counter() - started)
+
+    def resolve(self, key):
+        processor = self.pending.get(key)
+        if processor is None:
+            return
+        output = self.run(processor)
+        for provided in context_keys(processor):
+            if self.pending.get(provided) is processor:
+                del self.pending[provided]
+                if provided in output:
+                    self.values[provided] = output[provided]
+
+    def __contains__(self, key):
+        self.resolve(key)
+        return key in self.values
+
+    def __getitem__(self, key):
+        self.resolve(key)
+        return self.values[key]
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def keys(self):
+        # flatten() и {% debug %} читают всё
+        for key in list(self.pending):
+            self.resolve(key)
+        return self.values.keys()
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __repr__(self):
+        return repr(dict(self.values, **dict.fromkeys(self.pending, "…")))
+
+
+class LazyRequestContext(RequestContext):
+    @contextmanager
+    def bind_template(self, template):
+        if self.template is not None:
+            raise RuntimeError("Context is already bound to a template")
+        self.template = template
+        processors = (template.engine.template_context_processors
+                      + self._processors)
+        self.dicts[self._processors_index] = ProcessorContext(self.request,
+                                                              processors)
+        try:
+            yield
+        finally:
+            self.template = None
+            self.dicts[self._processors_index] = {}
+
+
+def make_context(context, request=None, **kwargs):
+    """django.template.context.make_context с ленивыми процессорами."""
+    if context is not None and not isinstance(context, dict):
+        raise TypeError("context must be a dict rather than "
+                        f"{context.__class__.__name__}.")
+    if request is None:
+        return Context(context, **kwargs)
+    result = LazyRequestContext(request, **kwargs)
+    if context:
+        result.push(context)
+    return result
+
+
+class Template(django_backend.Template):
+    def render(self, context=None, request=None):
+        started = time.perf_counter()
+        try:
+            context = make_context(
+                context, request, autoescape=self.backend.engine.autoescape)
+            try:
+                return self.template.render(context)
+            except TemplateDoesNotExist as exc:
+                django_backend.reraise(exc, self.backend)
+        finally:
+            metrics.add_template_time(time.perf_counter() - started)
+
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    """
+    Шаблоны Django, время рендера которых попадает в posts.metrics,
+    а контекст-процессоры вызываются лениво.
+    """
+
+    def from_string(self, template_code):
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return Template(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            django_backend.reraise(exc, self)
+
+
+def project_backend():
+    """Бэкенд шаблонов проекта: его псевдоним зависит от пути в настройках."""
+    for backend in engines.all():
+        if isinstance(backend, DjangoTemplates):
+            return backend
+    raise ImproperlyConfigured(
+        "В TEMPLATES нет бэкенда posts.templating.DjangoTemplates")
+
+
+def project_templates(backend):
+    """
+    Шаблоны проекта: (имя, путь) из DIRS и из templates/ его приложений.
+
+    Шаблоны сторонних пакетов вроде админки не входят.
+    """
+    found = {}
+    for directory in backend.template_dirs:
+        directory = str(directory)
+        if not directory.startswith(settings.BASE_DIR):
+            continue
+        for root, _, files in os.walk(directory):
+            for file_name in sorted(files):
+                path = os.path.join(root, file_name)
+                name = os.path.relpath(path, directory).replace(os.sep, "/")
+                # как у загрузчика: побеждает первая папка
+                found.setdefault(name, path)
+    return sorted(found.items())
+
+
+# ошибки отдельного шаблона: синтаксис, чужая кодировка, файл не читается
+TEMPLATE_ERRORS = (TemplateSyntaxError, UnicodeDecodeError, OSError)
+
+
+def parse_times(backend=None):
+    """Время разбора каждого шаблона проекта: [(имя, секунды, ошибка)]."""
+    backend = backend or project_backend()
+    results = []
+    for name, path in project_templates(backend):
+        started = time.perf_counter()
+        try:
+            with open(path, encoding=backend.engine.file_charset) as source:
+                code = source.read()
+            started = time.perf_counter()
+            CompiledTemplate(code, Origin(path, name), name, backend.engine)
+            error = None
+        except TEMPLATE_ERRORS as exc:
+            error = exc
+        results.append((name, time.perf_counter() - started, error))
+    return results
+
+
+def warm_templates(backend=None):
+    """
+    Разбирает все шаблоны проекта заранее.
+
+    С кеширующим загрузчиком, который Django включает при DEBUG = False,
+    разобранные шаблоны остаются в памяти, и первые запросы воркера
+    не тратят время на их поиск и разбор. Возвращает число шаблонов.
+    """
+    backend = backend or project_backend()
+    warmed = 0
+    for name, _ in project_templates(backend):
+        try:
+            backend.engine.get_template(name)
+        except TEMPLATE_ERRORS:
+            # сломанный шаблон не должен ронять воркер при старте,
+            # его покажет check_templates
+            continue
+        warmed += 1
+    return warmed
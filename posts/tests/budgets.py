@@ -0,0 +1,80 @@
+"""
+Бюджеты SQL-запросов для представлений.
+
+QueryBudgetMixin прогоняет запросы тестового клиента на наборах данных
+растущего размера и проверяет, что каждое представление укладывается
+в бюджет своего имени URL и что число запросов не растёт с данными.
+"""
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, get_resolver
+
+
+def url_names(urlconf):
+    """Имена всех маршрутов модуля urls."""
+    return {pattern.name for pattern in get_resolver(urlconf).url_patterns
+            if isinstance(pattern, URLPattern) and pattern.name}
+
+
+class QueryBudgetMixin:
+    # имя URL -> наибольшее допустимое число запросов
+    query_budgets = {}
+    # модули urls, каждый маршрут которых обязан иметь бюджет
+    budget_urlconfs = ()
+    # размеры набора данных, на которых сравнивается число запросов
+    dataset_sizes = (1, 5, 25)
+
+    def grow(self, size):
+        """Доводит набор данных до размера size."""
+        raise NotImplementedError
+
+    def budget_requests(self):
+        """
+        Запросы для замера: (клиент, метод, имя URL, путь, данные).
+
+        Вызывается заново на каждом размере набора данных.
+        """
+        raise NotImplementedError
+
+    def fetch(self, client, method, path, data):
+        response = getattr(client, method)(path, data or {})
+        # запросы потокового ответа выполняются при чтении его тела
+        if response.streaming:
+            b"".join(response.streaming_content)
+        return response
+
+    def count_queries(self, client, method, path, data):
+        # счётчики и фрагменты в кеше скрыли бы запросы холодного кеша
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            self.fetch(client, method, path, data)
+        return len(queries)
+
+    def test_query_budgets(self):
+        # первый запрос прогревает кеши процесса: сайт, шаблоны, ContentType
+        for client, method, _, path, data in self.budget_requests():
+            self.fetch(client, method, path, data)
+        counts = defaultdict(dict)
+        for size in self.dataset_sizes:
+            self.grow(size)
+            for client, method, name, path, data in self.budget_requests():
+                counts[name, method][size] = self.count_queries(
+                    client, method, path, data)
+        for (name, method), by_size in counts.items():
+            with self.subTest(name=name, method=method):
+                self.assertLessEqual(max(by_size.values()),
+                                     self.query_budgets[name], by_size)
+                self.assertEqual(len(set(by_size.values())), 1,
+                                 f"число запросов растёт с данными: "
+                                 f"{by_size}")
+
+    def test_every_view_has_budget(self):
+        names = set()
+        for urlconf in self.budget_urlconfs:
+            names |= url_names(urlconf)
+        self.assertEqual(names - self.query_budgets.keys(), set())
+        measured = {name for _, _, name, _, _ in self.budget_requests()}
+        self.assertEqual(self.query_budgets.keys() - measured, set())
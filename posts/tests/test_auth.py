@@ -0,0 +1,107 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.auth import UserCache, users
+from posts.checks import check_auth_cache
+from posts.models import User
+
+USERNAME = 'testname'
+PASSWORD = 'Yatube-auth-42'
+NEW_PASSWORD = 'Yatube-auth-43'
+NEW_POST_PAGE = reverse('new_post')
+PASSWORD_CHANGE_PAGE = reverse('password_change')
+LOGOUT_PAGE = reverse('logout')
+
+
+# в тестах один процесс, поэтому кеш в памяти ведёт себя как общий
+@override_settings(
+    AUTH_USER_CACHE_SIZE=1000,
+    SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+class CachedAuthTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username=USERNAME,
+                                            password=PASSWORD)
+
+    def setUp(self):
+        cache.clear()
+        users.clear()
+        self.client = self.login()
+
+    def login(self):
+        client = Client()
+        self.assertTrue(client.login(username=USERNAME, password=PASSWORD))
+        return client
+
+    def auth_queries(self, client):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(NEW_POST_PAGE)
+        self.assertEqual(response.status_code, 200)
+        return [query['sql'] for query in queries
+                if 'django_session' in query['sql']
+                or query['sql'].startswith('SELECT "auth_user"')]
+
+    def test_hot_path_has_no_session_or_user_queries(self):
+        self.client.get(NEW_POST_PAGE)
+        self.assertEqual(self.auth_queries(self.client), [])
+
+    def test_user_change_is_seen_at_once(self):
+        self.client.get(NEW_POST_PAGE)
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = 'Fresh'
+        user.save()
+        response = self.client.get(NEW_POST_PAGE)
+        self.assertEqual(response.context['user'].first_name, 'Fresh')
+
+    def test_password_change_ends_other_sessions(self):
+        other = self.login()
+        other.get(NEW_POST_PAGE)
+        response = self.client.post(PASSWORD_CHANGE_PAGE, {
+            'old_password': PASSWORD,
+            'new_password1': NEW_PASSWORD,
+            'new_password2': NEW_PASSWORD,
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.client.get(NEW_POST_PAGE).status_code, 200)
+        self.assertEqual(other.get(NEW_POST_PAGE).status_code, 302)
+
+    def test_logout_forgets_user(self):
+        self.client.get(NEW_POST_PAGE)
+        self.assertIn(self.user.pk, users.entries)
+        self.client.get(LOGOUT_PAGE)
+        self.assertNotIn(self.user.pk, users.entries)
+        self.assertEqual(self.client.get(NEW_POST_PAGE).status_code, 302)
+
+    @override_settings(AUTH_USER_CACHE_SIZE=2)
+    def test_least_recently_used_user_is_evicted(self):
+        lru = UserCache()
+        for pk in (1, 2):
+            lru.put(pk, 'v', 'default', ())
+        lru.get(1, 'v')
+        lru.put(3, 'v', 'default', ())
+        self.assertEqual(list(lru.entries), [1, 3])
+        self.assertIsNone(lru.get(1, 'other version'))
+
+
+class AuthCacheCheckTests(SimpleTestCase):
+    def test_defaults_pass(self):
+        self.assertEqual(check_auth_cache(None), [])
+
+    @override_settings(
+        AUTH_USER_CACHE_SIZE=1000,
+        SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+    def test_process_local_cache_is_refused(self):
+        ids = [error.id for error in check_auth_cache(None)]
+        self.assertEqual(ids, ['posts.E001', 'posts.E002'])
+
+    @override_settings(
+        AUTH_USER_CACHE_SIZE=1000,
+        SESSION_ENGINE='django.contrib.sessions.backends.cached_db',
+        CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.'
+                       'MemcachedCache'}})
+    def test_shared_cache_is_accepted(self):
+        self.assertEqual(check_auth_cache(None), [])
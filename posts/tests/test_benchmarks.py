@@ -0,0 +1,44 @@
+import random
+
+from django.test import TestCase
+
+from benchmarks.factories import seed
+from benchmarks.scenarios import SCENARIOS, Corpus, percentile
+from posts.models import AuthorCounter, Group, Post, User
+
+USERS = 5
+GROUPS = 3
+POSTS = 30
+
+
+class BenchmarkFactoriesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        seed(users=USERS, groups=GROUPS, posts=POSTS)
+
+    def test_seed_creates_corpus_with_counters(self):
+        self.assertEqual(User.objects.count(), USERS)
+        self.assertEqual(Group.objects.count(), GROUPS)
+        self.assertEqual(Post.objects.count(), POSTS)
+        self.assertEqual(sum(AuthorCounter.objects.values_list(
+            'posts_count', flat=True)), POSTS)
+        self.assertEqual(
+            len(set(Post.objects.values_list('pub_date', flat=True))),
+            POSTS)
+
+    def test_scenarios_build_requests(self):
+        corpus = Corpus()
+        for name, scenario in SCENARIOS.items():
+            with self.subTest(name=name):
+                request = scenario(random.Random(0), corpus)
+                environ = request.environ()
+                self.assertTrue(environ['PATH_INFO'].startswith('/'))
+                if request.form is not None:
+                    self.assertEqual(environ['REQUEST_METHOD'], 'POST')
+                    self.assertIn('csrftoken=', environ['HTTP_COOKIE'])
+
+    def test_percentile(self):
+        latencies = list(range(1, 101))
+        self.assertAlmostEqual(percentile(latencies, 50), 50.5)
+        self.assertAlmostEqual(percentile(latencies, 99), 99.99)
@@ -0,0 +1,117 @@
+from itertools import count
+
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+from posts.tests.budgets import QueryBudgetMixin
+
+USERNAME = 'testname'
+STAFF_USERNAME = 'staff'
+TITLE = 'testtitle'
+SLUG = 'testslug'
+TEXT = 'test post'
+PASSWORD = 'Yatube-budget-42'
+
+
+class ViewQueryBudgetTests(QueryBudgetMixin, TestCase):
+    # пользователь авторизованного клиента входит в бюджет, сессия
+    # хранится в подписанной куке
+    query_budgets = {
+        'error404': 1,
+        'error500': 1,
+        'index': 3,
+        'index_feed_atom': 2,
+        'index_feed_json': 2,
+        'group_posts': 3,
+        'group_feed_atom': 3,
+        'group_feed_json': 3,
+        'request_metrics': 1,
+        # вставка поста, счётчики автора и группы
+        'new_post': 6,
+        'search': 3,
+        'profile': 3,
+        'profile_feed_atom': 3,
+        'profile_feed_json': 3,
+        'post': 2,
+        'post_edit': 5,
+        'signup': 2,
+    }
+    budget_urlconfs = ('posts.urls', 'users.urls')
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username=USERNAME)
+        cls.staff = User.objects.create(username=STAFF_USERNAME,
+                                        is_staff=True)
+        cls.group = Group.objects.create(title=TITLE, slug=SLUG)
+        cls.post = Post.objects.create(text=TEXT, author=cls.author,
+                                       group=cls.group)
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+        self.signups = count()
+
+    def grow(self, size):
+        # у автора и в группе по size постов, и столько же других авторов
+        posts = self.author.posts.count()
+        for i in range(posts, size):
+            Post.objects.create(text=f'{TEXT} {i}', author=self.author,
+                                group=self.group)
+            Post.objects.create(
+                text=f'{TEXT} {i}', group=self.group,
+                author=User.objects.create(username=f'{USERNAME}{i}'))
+
+    def budget_requests(self):
+        author = {'username': USERNAME}
+        post = {'username': USERNAME, 'post_id': self.post.pk}
+        group = {'slug': SLUG}
+        form = {'text': TEXT, 'group': self.group.pk}
+        client = self.authorized_client
+        return [
+            (client, 'get', 'error404', reverse('error404'), None),
+            (client, 'get', 'error500', reverse('error500'), None),
+            (client, 'get', 'index', reverse('index'), None),
+            (client, 'get', 'index_feed_atom',
+             reverse('index_feed_atom'), None),
+            (client, 'get', 'index_feed_json',
+             reverse('index_feed_json'), None),
+            (client, 'get', 'group_posts',
+             reverse('group_posts', kwargs=group), None),
+            (client, 'get', 'group_feed_atom',
+             reverse('group_feed_atom', kwargs=group), None),
+            (client, 'get', 'group_feed_json',
+             reverse('group_feed_json', kwargs=group), None),
+            (self.staff_client, 'get', 'request_metrics',
+             reverse('request_metrics'), None),
+            (client, 'get', 'new_post', reverse('new_post'), None),
+            (client, 'post', 'new_post', reverse('new_post'), form),
+            (client, 'get', 'search', reverse('search'), {'q': TEXT}),
+            (client, 'get', 'profile', reverse('profile', kwargs=author),
+             None),
+            (client, 'get', 'profile_feed_atom',
+             reverse('profile_feed_atom', kwargs=author), None),
+            (client, 'get', 'profile_feed_json',
+             reverse('profile_feed_json', kwargs=author), None),
+            (client, 'get', 'post', reverse('post', kwargs=post), None),
+            (client, 'get', 'post_edit', reverse('post_edit', kwargs=post),
+             None),
+            (client, 'post', 'post_edit', reverse('post_edit', kwargs=post),
+             form),
+            (self.guest_client, 'get', 'signup', reverse('signup'), None),
+            (self.guest_client, 'post', 'signup', reverse('signup'), {
+                'username': f'new{next(self.signups)}',
+                'password1': PASSWORD,
+                'password2': PASSWORD,
+            }),
+        ]
+
+
+@override_settings(POSTS_STREAMING_FEEDS=True)
+class StreamingViewQueryBudgetTests(ViewQueryBudgetTests):
+    """Те же бюджеты, когда ленты отдаются потоком."""
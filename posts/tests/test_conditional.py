@@ -0,0 +1,87 @@
+import time
+
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+
+from posts.models import Group, Post, User
+
+
+TEXT = 'test post'
+TEXT2 = 'new post'
+USERNAME = 'testname'
+TITLE = 'testtitle'
+TITLE2 = 'testtitle2'
+SLUG = 'testslug'
+PROFILE_PAGE = reverse('profile', kwargs={'username': USERNAME})
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username=USERNAME)
+        cls.group = Group.objects.create(title=TITLE, slug=SLUG)
+        cls.post = Post.objects.create(text=TEXT, author=cls.author,
+                                       group=cls.group)
+        cls.post_page = reverse('post', kwargs={'username': USERNAME,
+                                                'post_id': cls.post.pk})
+        cls.post_edit_page = reverse('post_edit', kwargs={
+            'username': USERNAME, 'post_id': cls.post.pk})
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+
+    def assertNotModified(self, client, url, response, status_code=304):
+        self.assertEqual(client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag']).status_code,
+            status_code)
+
+    def test_unchanged_pages_are_not_rendered(self):
+        for url in (self.post_page, PROFILE_PAGE):
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                with self.assertNumQueries(1):
+                    self.assertNotModified(self.guest_client, url, response)
+                self.assertFalse(response.has_header('Last-Modified'))
+
+    def test_validators_depend_on_visitor(self):
+        for url in (self.post_page, PROFILE_PAGE):
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertNotModified(self.authorized_client, url, response,
+                                       status_code=200)
+
+    def test_post_edit_changes_validators(self):
+        responses = {url: self.authorized_client.get(url)
+                     for url in (self.post_page, PROFILE_PAGE)}
+        self.authorized_client.post(self.post_edit_page, {'text': TEXT2})
+        for url, response in responses.items():
+            with self.subTest(url=url):
+                self.assertNotModified(self.authorized_client, url, response,
+                                       status_code=200)
+
+    def test_group_edit_changes_validators(self):
+        responses = {url: self.guest_client.get(url)
+                     for url in (self.post_page, PROFILE_PAGE)}
+        group = Group.objects.get(pk=self.group.pk)
+        group.title = TITLE2
+        group.save()
+        for url, response in responses.items():
+            with self.subTest(url=url):
+                self.assertNotModified(self.guest_client, url, response,
+                                       status_code=200)
+
+    def test_post_delete_changes_profile(self):
+        Post.objects.create(text=TEXT2, author=self.author)
+        response = self.guest_client.get(PROFILE_PAGE)
+        # удалён не самый свежий пост: дата последней правки та же
+        Post.objects.filter(pk=self.post.pk).delete()
+        self.assertNotModified(self.guest_client, PROFILE_PAGE, response,
+                               status_code=200)
+        cached = self.guest_client.get(
+            PROFILE_PAGE, HTTP_IF_MODIFIED_SINCE=http_date(time.time()))
+        self.assertEqual(cached.status_code, 200)
+        self.assertNotContains(cached, TEXT)
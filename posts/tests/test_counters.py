@@ -0,0 +1,84 @@
+import io
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.counters import INDEX_COUNT_KEY
+from posts.models import AuthorCounter, Group, Post, User
+
+
+TEXT = 'test post'
+USERNAME = 'testname'
+TITLE = 'testtitle'
+DESCRIPTION = 'testdescription'
+SLUG = 'testslug'
+TITLE2 = 'testtitle2'
+SLUG2 = 'testslug2'
+INDEX_PAGE = reverse('index')
+GROUP_PAGE = reverse('group_posts', kwargs={'slug': SLUG})
+PROFILE_PAGE = reverse('profile', kwargs={'username': USERNAME})
+
+
+class FeedCountTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username=USERNAME)
+        cls.group = Group.objects.create(
+            title=TITLE,
+            description=DESCRIPTION,
+            slug=SLUG,
+        )
+        cls.group2 = Group.objects.create(title=TITLE2, slug=SLUG2)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.post = Post.objects.create(text=TEXT, author=self.author,
+                                        group=self.group)
+
+    def assertCounts(self, expected):
+        for url, count in expected.items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response.context['paginator'].count, count)
+
+    def test_counts_are_not_queried(self):
+        self.assertCounts({INDEX_PAGE: 1})
+        urls_queries = {INDEX_PAGE: 1, GROUP_PAGE: 2, PROFILE_PAGE: 2}
+        for url, queries in urls_queries.items():
+            with self.subTest(url=url):
+                with self.assertNumQueries(queries):
+                    self.guest_client.get(url)
+
+    def test_counts_follow_created_and_deleted_posts(self):
+        self.assertCounts({INDEX_PAGE: 1, GROUP_PAGE: 1, PROFILE_PAGE: 1})
+        Post.objects.create(text=TEXT, author=self.author, group=self.group)
+        self.assertCounts({INDEX_PAGE: 2, GROUP_PAGE: 2, PROFILE_PAGE: 2})
+        self.post.delete()
+        self.assertCounts({INDEX_PAGE: 1, GROUP_PAGE: 1, PROFILE_PAGE: 1})
+
+    def test_counts_follow_group_change(self):
+        post = Post.objects.get(pk=self.post.pk)
+        post.group = self.group2
+        post.save()
+        self.assertCounts({GROUP_PAGE: 0})
+        self.group2.refresh_from_db()
+        self.assertEqual(self.group2.posts_count, 1)
+
+    def test_recount_posts_rebuilds_counters(self):
+        Post.objects.bulk_create(
+            Post(text=TEXT, author=self.author, group=self.group2)
+            for _ in range(3)
+        )
+        AuthorCounter.objects.all().delete()
+        call_command('recount_posts', stdout=io.StringIO())
+        self.author.post_counter.refresh_from_db()
+        self.group.refresh_from_db()
+        self.group2.refresh_from_db()
+        self.assertEqual(self.author.post_counter.posts_count, 4)
+        self.assertEqual(self.group.posts_count, 1)
+        self.assertEqual(self.group2.posts_count, 3)
+        self.assertIsNone(cache.get(INDEX_COUNT_KEY))
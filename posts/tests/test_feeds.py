@@ -0,0 +1,79 @@
+import json
+
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+
+TEXT = 'test post'
+TEXT2 = 'new post'
+USERNAME = 'testname'
+TITLE = 'testtitle'
+SLUG = 'testslug'
+ATOM_FEEDS = (
+    reverse('index_feed_atom'),
+    reverse('group_feed_atom', kwargs={'slug': SLUG}),
+    reverse('profile_feed_atom', kwargs={'username': USERNAME}),
+)
+JSON_FEEDS = (
+    reverse('index_feed_json'),
+    reverse('group_feed_json', kwargs={'slug': SLUG}),
+    reverse('profile_feed_json', kwargs={'username': USERNAME}),
+)
+
+
+class FeedsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username=USERNAME)
+        cls.group = Group.objects.create(title=TITLE, slug=SLUG)
+        cls.post = Post.objects.create(text=TEXT, author=cls.author,
+                                       group=cls.group)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_atom_feeds(self):
+        for url in ATOM_FEEDS:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response['Content-Type'],
+                                 'application/atom+xml; charset=utf-8')
+                self.assertContains(response, TEXT)
+                self.assertContains(response, self.post.get_absolute_url())
+
+    def test_json_feeds(self):
+        for url in JSON_FEEDS:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                feed = json.loads(b''.join(response.streaming_content))
+                self.assertEqual(len(feed['items']), 1)
+                self.assertEqual(feed['items'][0]['content_text'], TEXT)
+                self.assertEqual(feed['items'][0]['tags'], [TITLE])
+
+    def test_conditional_get_skips_posts(self):
+        for url in ATOM_FEEDS + JSON_FEEDS:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                with self.assertNumQueries(1):
+                    cached = self.guest_client.get(
+                        url, HTTP_IF_NONE_MATCH=response['ETag'])
+                self.assertEqual(cached.status_code, 304)
+                cached = self.guest_client.get(
+                    url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+                self.assertEqual(cached.status_code, 304)
+
+    def test_new_post_changes_etag(self):
+        url = ATOM_FEEDS[1]
+        etag = self.guest_client.get(url)['ETag']
+        Post.objects.create(text=TEXT2, author=self.author, group=self.group)
+        response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, TEXT2)
+
+    def test_unknown_group_feed(self):
+        response = self.guest_client.get(
+            reverse('group_feed_atom', kwargs={'slug': 'unknown'}))
+        self.assertEqual(response.status_code, 404)
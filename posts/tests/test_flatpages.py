@@ -0,0 +1,67 @@
+from django.contrib.flatpages.models import FlatPage
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import User
+
+USERNAME = 'testname'
+ABOUT_AUTHOR_URL = reverse('about-author')
+ABOUT_SPEC_URL = reverse('about-spec')
+CONTENT = 'Об авторе'
+NEW_CONTENT = 'Обновлённый текст'
+
+
+class CachedFlatPageTests(TestCase):
+    def setUp(self):
+        self.guest_client = Client()
+        self.page = FlatPage.objects.create(
+            url=ABOUT_AUTHOR_URL, title='author', content=CONTENT)
+        self.page.sites.add(Site.objects.get_current())
+        self.guest_client.get(ABOUT_AUTHOR_URL)
+
+    def test_repeat_visit_costs_no_queries_or_templates(self):
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(ABOUT_AUTHOR_URL)
+        self.assertContains(response, CONTENT)
+        self.assertEqual(response.templates, [])
+
+    def test_saving_flatpage_refreshes_cache(self):
+        self.page.content = NEW_CONTENT
+        self.page.save()
+        response = self.guest_client.get(ABOUT_AUTHOR_URL)
+        self.assertContains(response, NEW_CONTENT)
+
+    def test_page_lives_only_in_configured_cache(self):
+        # правка, сброс версии которой до этого воркера не дошёл
+        FlatPage.objects.filter(pk=self.page.pk).update(content=NEW_CONTENT)
+        self.assertContains(self.guest_client.get(ABOUT_AUTHOR_URL), CONTENT)
+        # истечение FLATPAGES_CACHE_TIMEOUT
+        cache.clear()
+        self.assertContains(self.guest_client.get(ABOUT_AUTHOR_URL),
+                            NEW_CONTENT)
+
+    def test_deleted_flatpage_is_not_found(self):
+        self.page.delete()
+        response = self.guest_client.get(ABOUT_AUTHOR_URL)
+        self.assertEqual(response.status_code, 404)
+
+    def test_user_sees_own_menu_without_flatpage_query(self):
+        user = User.objects.create(username=USERNAME)
+        client = Client()
+        client.force_login(user)
+        # только пользователь: сессия в куке, FlatPage в кеше
+        with self.assertNumQueries(1):
+            response = client.get(ABOUT_AUTHOR_URL)
+        self.assertContains(response, CONTENT)
+        self.assertContains(response, USERNAME)
+
+    def test_pages_are_cached_separately(self):
+        spec = FlatPage.objects.create(url=ABOUT_SPEC_URL, title='spec',
+                                       content='Технологии')
+        spec.sites.add(Site.objects.get_current())
+        self.assertContains(self.guest_client.get(ABOUT_SPEC_URL),
+                            'Технологии')
+        self.assertContains(self.guest_client.get(ABOUT_AUTHOR_URL),
+                            CONTENT)
@@ -55,11 +55,11 @@ class PostFormTests(TestCase):
                 description=DESCRIPTION,
                 slug=SLUG,
             ),
-            #image=SimpleUploadedFile(
-            #    name=NAME_GIF,
-            #    content=SMALL_GIF,
-            #    content_type=CONTENT_TYPE
-            #),
+            image=SimpleUploadedFile(
+                name=NAME_GIF,
+                content=SMALL_GIF,
+                content_type=CONTENT_TYPE
+            ),
         )
         cls.group2 = Group.objects.create(
             title=TITLE2,
@@ -91,7 +91,7 @@ class PostFormTests(TestCase):
             form_data = {
                 'text': TEXT2,
                 'group': self.group2.id,
-                #'image': image,
+                'image': image,
             }
             response = self.guest_client.post(
                 NEW_POST_PAGE,
@@ -113,7 +113,7 @@ class PostFormTests(TestCase):
             form_data = {
                 'text': TEXT2,
                 'group': self.group2.id,
-                #'image': image,
+                'image': image,
             }
             response = self.authorized_client.post(
                 NEW_POST_PAGE,
@@ -123,7 +123,7 @@ class PostFormTests(TestCase):
             )
         self.assertEqual(response.status_code, 200)
         self.assertEqual(Post.objects.count(), posts_count + 1)
-        #self.assertEqual(uploaded.size, Post.objects.first().image.size)
+        self.assertEqual(uploaded.size, Post.objects.first().image.size)
         self.assertEqual(response.context.get('page')[0].author,
                          Post.objects.first().author)
         self.assertEqual(response.context.get('page')[0].text,
@@ -146,7 +146,7 @@ class PostFormTests(TestCase):
             form_data = {
                 'text': TEXT2,
                 'group': self.group2.id,
-                #'image': image,
+                'image': image,
             }
             response = self.guest_client.post(
                 reverse('post_edit', kwargs={
@@ -169,7 +169,7 @@ class PostFormTests(TestCase):
             form_data = {
                 'text': TEXT2,
                 'group': self.group2.id,
-                #'image': image,
+                'image': image,
             }
             response = self.authorized_client.post(
                 reverse('post_edit', kwargs={
@@ -180,7 +180,7 @@ class PostFormTests(TestCase):
             )
         self.assertEqual(response.status_code, 200)
         self.assertEqual(Post.objects.count(), posts_count)
-        #self.assertEqual(uploaded.size, Post.objects.first().image.size)
+        self.assertEqual(uploaded.size, Post.objects.first().image.size)
         self.assertEqual(response.context.get('post').author,
                          Post.objects.first().author)
         self.assertEqual(response.context.get('post').text,
@@ -0,0 +1,114 @@
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts import versions
+from posts.models import Group, Post, User
+
+
+TEXT = 'test post'
+TEXT2 = 'edited post'
+USERNAME = 'testname'
+TITLE = 'testtitle'
+TITLE2 = 'edited title'
+DESCRIPTION = 'testdescription'
+SLUG = 'testslug'
+INDEX_PAGE = reverse('index')
+GROUP_PAGE = reverse('group_posts', kwargs={'slug': SLUG})
+PROFILE_PAGE = reverse('profile', kwargs={'username': USERNAME})
+
+
+@override_settings(POSTS_FEED_CACHE_TIMEOUT=60)
+class FeedCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username=USERNAME)
+        cls.group = Group.objects.create(
+            title=TITLE,
+            description=DESCRIPTION,
+            slug=SLUG,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.post = Post.objects.create(text=TEXT, author=self.author,
+                                        group=self.group)
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+
+    def test_anonymous_feed_page_is_cached(self):
+        for url in (INDEX_PAGE, GROUP_PAGE, PROFILE_PAGE):
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                with self.assertNumQueries(0 if url == INDEX_PAGE else 1):
+                    cached = self.guest_client.get(url)
+                self.assertEqual(cached.content, response.content)
+
+    def test_authorized_feed_page_is_rendered(self):
+        self.authorized_client.get(INDEX_PAGE)
+        response = self.authorized_client.get(INDEX_PAGE)
+        self.assertTemplateUsed(response, 'index.html')
+
+    def test_post_edit_expires_its_pages_and_card(self):
+        for client in (self.guest_client, self.authorized_client):
+            client.get(INDEX_PAGE)
+        self.post.text = TEXT2
+        self.post.save()
+        for client in (self.guest_client, self.authorized_client):
+            for url in (INDEX_PAGE, GROUP_PAGE, PROFILE_PAGE):
+                with self.subTest(url=url):
+                    response = client.get(url)
+                    self.assertContains(response, TEXT2)
+                    self.assertNotContains(response, TEXT)
+
+    def test_group_edit_expires_cards(self):
+        for client in (self.guest_client, self.authorized_client):
+            client.get(INDEX_PAGE)
+        group = Group.objects.get(pk=self.group.pk)
+        group.title = TITLE2
+        group.save()
+        for client in (self.guest_client, self.authorized_client):
+            with self.subTest(client=client):
+                self.assertContains(client.get(INDEX_PAGE), TITLE2)
+
+    def test_group_rename_expires_profile_page(self):
+        self.guest_client.get(PROFILE_PAGE)
+        group = Group.objects.get(pk=self.group.pk)
+        group.title = TITLE2
+        group.save()
+        response = self.guest_client.get(PROFILE_PAGE)
+        self.assertContains(response, TITLE2)
+        self.assertNotContains(response, TITLE)
+
+    def test_group_delete_expires_profile_page(self):
+        self.assertContains(self.guest_client.get(PROFILE_PAGE), TITLE)
+        Group.objects.get(pk=self.group.pk).delete()
+        self.assertNotContains(self.guest_client.get(PROFILE_PAGE), TITLE)
+
+    def test_new_post_expires_feed_pages(self):
+        self.guest_client.get(INDEX_PAGE)
+        Post.objects.create(text=TEXT2, author=self.author)
+        self.assertContains(self.guest_client.get(INDEX_PAGE), TEXT2)
+
+    def test_unknown_query_params_share_cached_page(self):
+        response = self.guest_client.get(INDEX_PAGE)
+        with self.assertNumQueries(0):
+            cached = self.guest_client.get(INDEX_PAGE, {'utm': 'junk'})
+        self.assertEqual(cached.content, response.content)
+
+    def test_signup_keeps_cached_pages(self):
+        version = versions.get_versions([versions.AUTHORS_VERSION])
+        User.objects.create(username='newcomer')
+        self.author.last_name = ''
+        self.author.save()
+        self.assertEqual(
+            versions.get_versions([versions.AUTHORS_VERSION]), version)
+
+    def test_author_rename_expires_cards(self):
+        self.guest_client.get(INDEX_PAGE)
+        author = User.objects.get(pk=self.author.pk)
+        author.username = 'renamed'
+        author.save()
+        self.assertContains(self.guest_client.get(INDEX_PAGE), 'renamed')
@@ -0,0 +1,87 @@
+import io
+import json
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from posts.images import SIZES, make_renditions, render_post_image
+from posts.models import Post, User
+from posts.storage import post_image_storage
+
+USERNAME = 'testname'
+INDEX_PAGE = reverse('index')
+MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+def make_png(name='picture.png', color=(200, 30, 30, 255)):
+    buffer = io.BytesIO()
+    Image.new('RGBA', (1200, 800), color).save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(),
+                              content_type='image/png')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class PostImageTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username=USERNAME)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.post = Post.objects.create(text='text', author=self.author,
+                                        image=make_png())
+
+    def test_renditions_have_every_size_and_format(self):
+        renditions = make_renditions(self.post.image.name)
+        self.assertEqual(renditions['source'], self.post.image.name)
+        for width, height in SIZES:
+            for name, pillow_format in (('jpeg', 'JPEG'), ('webp', 'WEBP')):
+                with self.subTest(width=width, name=name):
+                    key = renditions['sizes'][width][name]
+                    with post_image_storage.open(key) as stored:
+                        image = Image.open(stored)
+                        self.assertEqual(image.size, (width, height))
+                        self.assertEqual(image.format, pillow_format)
+
+    def test_feed_shows_original_until_renditions_are_ready(self):
+        response = self.guest_client.get(INDEX_PAGE)
+        self.assertContains(response, self.post.image.url)
+        self.assertNotContains(response, 'srcset')
+
+    def test_feed_shows_srcset_when_renditions_are_ready(self):
+        render_post_image(self.post.pk, self.post.image.name)
+        post = Post.objects.get(pk=self.post.pk)
+        response = self.guest_client.get(INDEX_PAGE)
+        for width, keys in post.renditions.items():
+            for name in ('webp', 'jpeg'):
+                with self.subTest(width=width, name=name):
+                    url = post_image_storage.url(keys[name])
+                    self.assertContains(response, f'{url} {width}w')
+
+    def test_renditions_of_replaced_image_are_ignored(self):
+        render_post_image(self.post.pk, self.post.image.name)
+        post = Post.objects.get(pk=self.post.pk)
+        post.image = make_png('other.png', color=(30, 200, 30, 255))
+        post.save()
+        self.assertEqual(post.renditions, {})
+        stale = json.loads(post.image_renditions)['source']
+        render_post_image(post.pk, stale)
+        post.refresh_from_db()
+        self.assertEqual(post.renditions, {})
+
+    def test_command_renders_missing_renditions(self):
+        call_command('render_images', stdout=io.StringIO())
+        self.assertEqual(len(Post.objects.get(pk=self.post.pk).renditions),
+                         len(SIZES))
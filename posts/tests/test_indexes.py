@@ -0,0 +1,47 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from posts.models import Group, Post, User
+from posts.paginators import CursorPaginator, encode_cursor
+
+
+USERNAME = 'testname'
+TITLE = 'testtitle'
+SLUG = 'testslug'
+
+
+@skipUnless(connection.vendor == 'sqlite', 'проверяются планы SQLite')
+class FeedIndexesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username=USERNAME)
+        cls.group = Group.objects.create(title=TITLE, slug=SLUG)
+        cls.post = Post.objects.create(text='test post', author=cls.author,
+                                       group=cls.group)
+
+    def feed_queries(self):
+        feeds = {
+            'index': Post.objects.for_feed(),
+            'group': Post.objects.for_feed().filter(group=self.group),
+            'profile': Post.objects.for_feed().filter(author=self.author),
+        }
+        cursor = encode_cursor(self.post)
+        for name, post_list in feeds.items():
+            paginator = CursorPaginator(post_list, 10)
+            yield name, post_list[:10]
+            yield f'{name} after', paginator.seek(after=cursor)[:11]
+            yield f'{name} before', paginator.seek(before=cursor)[:11]
+
+    def test_feeds_use_indexes(self):
+        for name, queryset in self.feed_queries():
+            with self.subTest(feed=name):
+                plan = queryset.explain()
+                self.assertNotIn('TEMP B-TREE', plan, plan)
+                post_lines = [line for line in plan.splitlines()
+                              if 'posts_post' in line]
+                self.assertTrue(post_lines, plan)
+                for line in post_lines:
+                    self.assertIn('USING INDEX', line, plan)
@@ -0,0 +1,76 @@
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.metrics import Histogram, registry
+from posts.models import Post, User
+
+USERNAME = 'testname'
+STAFF_USERNAME = 'staff'
+INDEX_PAGE = reverse('index')
+METRICS_PAGE = reverse('request_metrics')
+
+
+class MetricsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username=USERNAME)
+        cls.post = Post.objects.create(text='text', author=cls.author)
+        cls.staff = User.objects.create(username=STAFF_USERNAME,
+                                        is_staff=True)
+
+    def setUp(self):
+        registry.clear()
+        self.guest_client = Client()
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+
+    @override_settings(POSTS_SERVER_TIMING=True)
+    def test_response_has_server_timing(self):
+        response = self.guest_client.get(INDEX_PAGE)
+        timing = response['Server-Timing']
+        for name in ('sql;dur=', 'tpl;dur=', 'total;dur='):
+            with self.subTest(name=name):
+                self.assertIn(name, timing)
+
+    @override_settings(POSTS_SERVER_TIMING=False)
+    def test_server_timing_can_be_turned_off(self):
+        response = self.guest_client.get(INDEX_PAGE)
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_metrics_are_grouped_by_url_name(self):
+        post_page = reverse('post', kwargs={'username': USERNAME,
+                                            'post_id': self.post.pk})
+        for _ in range(3):
+            self.guest_client.get(INDEX_PAGE)
+        self.guest_client.get(post_page)
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot['index']['total']['count'], 3)
+        self.assertEqual(snapshot['post']['total']['count'], 1)
+        self.assertGreater(snapshot['post']['queries']['sum'], 0)
+        self.assertGreater(snapshot['post']['template']['sum'], 0)
+
+    def test_context_processors_are_timed_per_url_name(self):
+        self.guest_client.get(INDEX_PAGE)
+        metrics = registry.snapshot()['index']
+        # подвал читает год, а debug в шаблонах не используется
+        self.assertEqual(
+            metrics['context:context_processors.year.year']['count'], 1)
+        self.assertNotIn(
+            'context:django.template.context_processors.debug', metrics)
+
+    def test_dump_is_only_for_staff(self):
+        response = self.guest_client.get(METRICS_PAGE)
+        self.assertEqual(response.status_code, 302)
+        self.guest_client.get(INDEX_PAGE)
+        response = self.staff_client.get(METRICS_PAGE)
+        self.assertEqual(response.json()['index']['total']['count'], 1)
+
+    def test_histogram_quantiles(self):
+        histogram = Histogram()
+        for value in [1] * 90 + [40] * 9 + [3000]:
+            histogram.add(value)
+        self.assertEqual(histogram.quantile(0.5), 1)
+        self.assertEqual(histogram.quantile(0.95), 50)
+        self.assertEqual(histogram.quantile(0.99), 50)
+        self.assertEqual(histogram.quantile(1), 5000)
@@ -0,0 +1,105 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.utils import timezone
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+from posts.paginators import CursorPaginator, encode_cursor
+
+
+USERNAME = 'testname'
+TITLE = 'testtitle'
+DESCRIPTION = 'testdescription'
+SLUG = 'testslug'
+POSTS_COUNT = 13
+INDEX_PAGE = reverse('index')
+GROUP_PAGE = reverse('group_posts', kwargs={'slug': SLUG})
+PROFILE_PAGE = reverse('profile', kwargs={'username': USERNAME})
+
+
+@override_settings(POSTS_PAGINATION='cursor')
+class CursorPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username=USERNAME)
+        cls.group = Group.objects.create(
+            title=TITLE,
+            description=DESCRIPTION,
+            slug=SLUG,
+        )
+        Post.objects.bulk_create(
+            Post(text=f'post {i}', author=cls.author, group=cls.group)
+            for i in range(POSTS_COUNT)
+        )
+        cls.posts = list(Post.objects.order_by('-pub_date', '-pk'))
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_pages_follow_each_other(self):
+        paginator = CursorPaginator(Post.objects.all(), 10)
+        first = paginator.get_page()
+        self.assertEqual(list(first), self.posts[:10])
+        self.assertTrue(first.has_next())
+        self.assertFalse(first.has_previous())
+        second = paginator.get_page(after=first.next_cursor)
+        self.assertEqual(list(second), self.posts[10:])
+        self.assertFalse(second.has_next())
+        self.assertTrue(second.has_previous())
+        back = paginator.get_page(before=second.previous_cursor)
+        self.assertEqual(list(back), self.posts[:10])
+
+    def test_broken_cursor_opens_first_page(self):
+        paginator = CursorPaginator(Post.objects.all(), 10)
+        page = paginator.get_page(after='not-a-cursor')
+        self.assertEqual(list(page), self.posts[:10])
+
+    def test_out_of_range_cursor_opens_first_page(self):
+        past = Post(pk=1, pub_date=timezone.now().replace(year=2000))
+        future = Post(pk=1, pub_date=timezone.now().replace(year=2999))
+        for params in ({'after': encode_cursor(past)},
+                       {'before': encode_cursor(future)}):
+            with self.subTest(params=params):
+                response = self.guest_client.get(INDEX_PAGE, params)
+                self.assertEqual(response.status_code, 200)
+                page = response.context.get('page')
+                self.assertEqual(list(page), self.posts[:10])
+                self.assertFalse(page.has_previous())
+                self.assertIsNone(page.previous_cursor)
+
+    def test_empty_page_has_no_cursors(self):
+        paginator = CursorPaginator(Post.objects.none(), 10)
+        page = paginator.get_page()
+        self.assertFalse(page.has_other_pages())
+        self.assertIsNone(page.next_cursor)
+        self.assertIsNone(page.previous_cursor)
+
+    def test_feeds_use_cursor_pagination(self):
+        for url in (INDEX_PAGE, GROUP_PAGE, PROFILE_PAGE):
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                page = response.context.get('page')
+                self.assertEqual(list(page), self.posts[:10])
+                self.assertContains(response, f'?after={page.next_cursor}')
+                response = self.guest_client.get(
+                    url, {'after': page.next_cursor})
+                self.assertEqual(
+                    list(response.context.get('page')), self.posts[10:])
+
+    def test_count_is_lazy(self):
+        count = mock.Mock(return_value=POSTS_COUNT)
+        paginator = CursorPaginator(Post.objects.all(), 10, count=count)
+        paginator.get_page()
+        count.assert_not_called()
+        self.assertEqual(paginator.count, POSTS_COUNT)
+        count.assert_called_once_with()
+
+    def test_index_skips_count(self):
+        cache.clear()
+        with mock.patch('posts.views.index_count') as index_count:
+            response = self.guest_client.get(INDEX_PAGE)
+        self.assertEqual(response.status_code, 200)
+        index_count.assert_not_called()
@@ -0,0 +1,88 @@
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import AuthorCounter, Post, User
+from posts.routers import PIN_COOKIE, ReplicaRouter
+
+USERNAME = 'testname'
+PRIMARY_TEXT = 'primary post'
+REPLICA_TEXT = 'replica post'
+NEW_TEXT = 'new post'
+INDEX_PAGE = reverse('index')
+NEW_POST_PAGE = reverse('new_post')
+PROFILE_PAGE = reverse('profile', kwargs={'username': USERNAME})
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTests(TestCase):
+    databases = {'default', 'replica'}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username=USERNAME)
+        cls.primary_post = Post.objects.create(text=PRIMARY_TEXT,
+                                               author=cls.author)
+        # реплика отстала: в ней другой пост того же автора
+        User.objects.using('replica').bulk_create([
+            User(pk=cls.author.pk, username=USERNAME)])
+        Post.objects.using('replica').bulk_create([
+            Post(pk=cls.primary_post.pk + 1, text=REPLICA_TEXT,
+                 author_id=cls.author.pk)])
+        AuthorCounter.objects.using('replica').bulk_create([
+            AuthorCounter(author_id=cls.author.pk, posts_count=1)])
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+
+    def texts(self, response):
+        return [post.text for post in response.context['page']]
+
+    def test_feeds_read_from_replica(self):
+        for url in (INDEX_PAGE, PROFILE_PAGE):
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(self.texts(response), [REPLICA_TEXT])
+
+    def test_post_page_reads_from_replica(self):
+        url = reverse('post', kwargs={'username': USERNAME,
+                                      'post_id': self.primary_post.pk + 1})
+        self.assertEqual(self.guest_client.get(url).status_code, 200)
+
+    def test_pinned_client_reads_from_primary(self):
+        self.guest_client.cookies[PIN_COOKIE] = '1'
+        response = self.guest_client.get(INDEX_PAGE)
+        self.assertEqual(self.texts(response), [PRIMARY_TEXT])
+
+    def test_write_pins_client_to_primary(self):
+        response = self.authorized_client.post(NEW_POST_PAGE,
+                                               {'text': NEW_TEXT})
+        self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertTrue(Post.objects.filter(text=NEW_TEXT).exists())
+        self.assertFalse(
+            Post.objects.using('replica').filter(text=NEW_TEXT).exists())
+        response = self.authorized_client.get(INDEX_PAGE)
+        self.assertEqual(self.texts(response), [NEW_TEXT, PRIMARY_TEXT])
+
+    def test_request_user_is_read_from_primary(self):
+        # на реплике пользователь ещё активен
+        User.objects.filter(pk=self.author.pk).update(is_active=False)
+        response = self.authorized_client.get(INDEX_PAGE)
+        self.assertFalse(response.context['user'].is_authenticated)
+
+    def test_other_views_read_from_primary(self):
+        response = self.guest_client.get(reverse('search'),
+                                          {'q': PRIMARY_TEXT})
+        self.assertEqual(self.texts(response), [PRIMARY_TEXT])
+
+    def test_replica_objects_are_saved_to_primary(self):
+        post = Post.objects.using('replica').get()
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_write(Post, instance=post), 'default')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_means_primary(self):
+        response = self.guest_client.get(INDEX_PAGE)
+        self.assertEqual(self.texts(response), [PRIMARY_TEXT])
@@ -0,0 +1,60 @@
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post, User
+from posts.search import search_posts
+
+
+USERNAME = 'testname'
+SEARCH_PAGE = reverse('search')
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username=USERNAME)
+        cls.cats = Post.objects.create(
+            text='Кошки любят спать. Кошки везде!', author=cls.author)
+        cls.dogs = Post.objects.create(
+            text='Собаки и кошки гуляют вместе', author=cls.author)
+        cls.birds = Post.objects.create(
+            text='Птицы поют по утрам', author=cls.author)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def search(self, query):
+        return list(search_posts(Post.objects.all(), query))
+
+    def test_search_is_ranked(self):
+        self.assertEqual(self.search('кошки'), [self.cats, self.dogs])
+        self.assertEqual(self.search('КОШ'), [self.cats, self.dogs])
+        self.assertEqual(self.search('кошки гуляют'), [self.dogs])
+        self.assertEqual(self.search('"; DROP'), [])
+        self.assertEqual(self.search('  '), [])
+
+    def test_index_follows_post_writes(self):
+        post = Post.objects.get(pk=self.birds.pk)
+        post.text = 'Кошки ловят птиц'
+        post.save()
+        self.assertIn(post, self.search('кошки'))
+        self.assertEqual(self.search('поют'), [])
+        post.delete()
+        self.assertEqual(self.search('птиц'), [])
+
+    def test_search_page_shows_results(self):
+        response = self.guest_client.get(SEARCH_PAGE, {'q': 'птицы'})
+        self.assertTemplateUsed(response, 'search.html')
+        self.assertEqual(list(response.context['page']), [self.birds])
+        self.assertContains(response, self.birds.text)
+        self.assertNotContains(response, self.cats.text)
+
+    def test_admin_search_uses_index(self):
+        admin = User.objects.create_superuser('admin', 'a@a.ru', 'pass')
+        client = Client()
+        client.force_login(admin)
+        response = client.get(reverse('admin:posts_post_changelist'),
+                              {'q': 'собаки'})
+        self.assertEqual(list(response.context['cl'].result_list),
+                         [self.dogs])
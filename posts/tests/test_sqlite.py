@@ -0,0 +1,35 @@
+import io
+from unittest import skipUnless
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+
+PRAGMAS = {'synchronous': 'normal', 'busy_timeout': 4321,
+           'cache_size': -2048}
+
+
+@skipUnless(connection.vendor == 'sqlite', 'PRAGMA есть только в SQLite')
+class SQLiteTuningTests(TestCase):
+    def test_new_connection_gets_pragmas(self):
+        with override_settings(SQLITE_PRAGMAS=PRAGMAS):
+            db = connection.copy()
+            try:
+                with db.cursor() as cursor:
+                    values = [cursor.execute(f'PRAGMA {name}').fetchone()[0]
+                              for name in PRAGMAS]
+            finally:
+                db.close()
+        self.assertEqual(values, [1, 4321, -2048])
+
+    def test_production_pragmas_turn_on_wal(self):
+        self.assertEqual(
+            settings.SQLITE_PRODUCTION_PRAGMAS['journal_mode'], 'wal')
+
+    def test_benchmark_reports_both_modes(self):
+        out = io.StringIO()
+        call_command('benchmark_sqlite', seconds=0.2, rows=100,
+                     readers=1, writers=1, stdout=out)
+        self.assertIn('по умолчанию', out.getvalue())
+        self.assertIn('продакшен', out.getvalue())
@@ -0,0 +1,93 @@
+import gzip
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from posts.staticfiles import StaticFilesMiddleware, accepted_encodings
+
+STATIC_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+ASSETS_DIR = tempfile.mkdtemp(dir=settings.BASE_DIR)
+CSS = 'body { color: red; }\n' * 50
+
+
+@override_settings(
+    STATIC_ROOT=STATIC_ROOT, STATICFILES_DIRS=[ASSETS_DIR],
+    STATICFILES_STORAGE=(
+        'posts.staticfiles.CompressedManifestStaticFilesStorage'),
+    STATIC_SERVE=True)
+class StaticPipelineTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(os.path.join(ASSETS_DIR, 'css'))
+        with open(os.path.join(ASSETS_DIR, 'css', 'app.css'), 'w') as file:
+            file.write(CSS)
+        call_command('collectstatic', interactive=False, verbosity=0)
+        cls.hashed = staticfiles_storage.stored_name('css/app.css')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(STATIC_ROOT, ignore_errors=True)
+        shutil.rmtree(ASSETS_DIR, ignore_errors=True)
+        super().tearDownClass()
+
+    def get(self, name, **headers):
+        middleware = StaticFilesMiddleware(lambda request: HttpResponse())
+        request = RequestFactory().get(settings.STATIC_URL + name, **headers)
+        return middleware(request)
+
+    def test_collectstatic_fingerprints_and_compresses(self):
+        self.assertNotEqual(self.hashed, 'css/app.css')
+        path = os.path.join(STATIC_ROOT, self.hashed)
+        with open(path + '.gz', 'rb') as file:
+            self.assertEqual(gzip.decompress(file.read()).decode(), CSS)
+
+    def test_gzip_is_negotiated(self):
+        response = self.get(self.hashed, HTTP_ACCEPT_ENCODING='gzip, br;q=0')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(gzip.decompress(b''.join(response)).decode(), CSS)
+
+    def test_identity_without_accept_encoding(self):
+        response = self.get(self.hashed)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(b''.join(response).decode(), CSS)
+
+    def test_cache_control(self):
+        immutable = self.get(self.hashed)['Cache-Control']
+        self.assertIn(f'max-age={settings.STATIC_IMMUTABLE_MAX_AGE}',
+                      immutable)
+        self.assertIn('immutable', immutable)
+        self.assertEqual(self.get('css/app.css')['Cache-Control'],
+                         f'public, max-age={settings.STATIC_MAX_AGE}')
+
+    def test_not_modified(self):
+        response = self.get(self.hashed)
+        response = self.get(
+            self.hashed, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_missing_file_keeps_plain_url(self):
+        template = Template(
+            "{% load static %}{% static 'bootstrap/css/missing.css' %}")
+        self.assertEqual(template.render(Context()),
+                         settings.STATIC_URL + 'bootstrap/css/missing.css')
+        self.assertEqual(staticfiles_storage.url('css/app.css'),
+                         settings.STATIC_URL + self.hashed)
+
+    def test_missing_and_outside_files_fall_through(self):
+        for name in ('css/missing.css', '../manage.py'):
+            with self.subTest(name=name):
+                self.assertFalse(self.get(name).has_header('Cache-Control'))
+
+    def test_accepted_encodings(self):
+        self.assertEqual(accepted_encodings('gzip;q=0.5, br;q=0, deflate'),
+                         {'gzip', 'deflate'})
@@ -0,0 +1,100 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from posts.images import render_post_image
+from posts.models import Post, User
+from posts.storage import post_image_storage
+from posts.tests.test_images import make_png
+
+USERNAME = 'testname'
+MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ContentAddressedStorageTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username=USERNAME)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def create_post(self, image):
+        return Post.objects.create(text='text', author=self.author,
+                                   image=image)
+
+    def test_identical_uploads_share_one_file(self):
+        first = self.create_post(make_png('first.png'))
+        second = self.create_post(make_png('second.PNG'))
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertTrue(first.image.name.endswith('.png'))
+        directory = os.path.dirname(first.image.path)
+        self.assertEqual(os.listdir(directory),
+                         [os.path.basename(first.image.name)])
+
+    def test_different_uploads_get_different_files(self):
+        first = self.create_post(make_png())
+        second = self.create_post(make_png(color=(0, 0, 255, 255)))
+        self.assertNotEqual(first.image.name, second.image.name)
+
+    def test_renditions_are_shared_between_identical_uploads(self):
+        first = self.create_post(make_png())
+        render_post_image(first.pk, first.image.name)
+        second = self.create_post(make_png('copy.png'))
+        with self.assertNumQueries(3):
+            render_post_image(second.pk, second.image.name)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(second.renditions, first.renditions)
+
+    def test_gc_removes_only_orphaned_files(self):
+        post = self.create_post(make_png())
+        render_post_image(post.pk, post.image.name)
+        post.refresh_from_db()
+        orphan = post_image_storage.save('posts/orphan.png',
+                                         ContentFile(b'orphan'))
+        call_command('gc_images', min_age=0, stdout=io.StringIO())
+        self.assertFalse(post_image_storage.exists(orphan))
+        self.assertTrue(post_image_storage.exists(post.image.name))
+        stored = json.loads(post.image_renditions)
+        for keys in stored['sizes'].values():
+            for key in keys.values():
+                with self.subTest(key=key):
+                    self.assertTrue(post_image_storage.exists(key))
+
+    def test_gc_keeps_fresh_files(self):
+        orphan = post_image_storage.save('posts/fresh.png',
+                                         ContentFile(b'fresh'))
+        call_command('gc_images', stdout=io.StringIO())
+        self.assertTrue(post_image_storage.exists(orphan))
+
+    def test_dedup_hit_refreshes_mtime(self):
+        name = post_image_storage.save('posts/old.png', ContentFile(b'old'))
+        path = post_image_storage.path(name)
+        old = time.time() - 7 * 24 * 60 * 60
+        os.utime(path, (old, old))
+        post_image_storage.save('posts/again.png', ContentFile(b'old'))
+        self.assertGreater(os.path.getmtime(path), old + 60)
+
+    def test_gc_rechecks_references_before_delete(self):
+        post = Post.objects.create(text='text', author=self.author,
+                                   image=make_png('late.png'))
+        # пост сохранён уже после того, как gc прочитал ссылки
+        with mock.patch(
+                'posts.management.commands.gc_images.referenced_files',
+                return_value=set()):
+            call_command('gc_images', min_age=0, stdout=io.StringIO())
+        self.assertTrue(post_image_storage.exists(post.image.name))
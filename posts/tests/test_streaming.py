@@ -0,0 +1,103 @@
+import re
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+USERNAME = 'testname'
+TITLE = 'testtitle'
+SLUG = 'testslug'
+INDEX_PAGE = reverse('index')
+GROUP_PAGE = reverse('group_posts', kwargs={'slug': SLUG})
+PROFILE_PAGE = reverse('profile', kwargs={'username': USERNAME})
+FEEDS = (INDEX_PAGE, GROUP_PAGE, PROFILE_PAGE)
+# столбец, который выбирают только запросы самих постов
+POST_ROWS = '"posts_post"."text"'
+
+
+def squeeze(content):
+    return re.sub(r'\s+', '', content)
+
+
+@override_settings(POSTS_STREAMING_FEEDS=True)
+class StreamingFeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username=USERNAME)
+        cls.group = Group.objects.create(title=TITLE, slug=SLUG)
+        cls.texts = [f'streamed post {i}' for i in range(3)]
+        for text in cls.texts:
+            Post.objects.create(text=text, author=cls.author,
+                                group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+
+    def test_head_is_sent_before_posts(self):
+        for url in FEEDS:
+            with self.subTest(url=url):
+                response = self.authorized_client.get(url)
+                self.assertTrue(response.streaming)
+                self.assertIn('paginator', response.context)
+                chunks = [chunk.decode()
+                          for chunk in response.streaming_content]
+                self.assertIn('<nav', chunks[0])
+                self.assertNotIn(self.texts[0], chunks[0])
+                self.assertEqual(len(chunks), len(self.texts) + 2)
+
+    def test_posts_are_queried_after_first_chunk(self):
+        for pagination in ('page', 'cursor'):
+            for url in FEEDS:
+                with self.subTest(pagination=pagination, url=url), \
+                        self.settings(POSTS_PAGINATION=pagination):
+                    with CaptureQueriesContext(connection) as queries:
+                        response = self.authorized_client.get(url)
+                        content = iter(response.streaming_content)
+                        next(content)
+                    self.assertFalse([query for query in queries
+                                      if POST_ROWS in query['sql']])
+                    with CaptureQueriesContext(connection) as queries:
+                        list(content)
+                    self.assertTrue([query for query in queries
+                                     if POST_ROWS in query['sql']])
+
+    @override_settings(POSTS_PAGINATION='cursor', POSTS_PER_PAGE=2)
+    def test_cursor_navigation_is_streamed(self):
+        for url in FEEDS:
+            with self.subTest(url=url):
+                streamed = b''.join(
+                    self.authorized_client.get(url).streaming_content)
+                with self.settings(POSTS_STREAMING_FEEDS=False):
+                    rendered = self.authorized_client.get(url).content
+                self.assertIn(b'?after=', streamed)
+                self.assertEqual(squeeze(streamed.decode()),
+                                 squeeze(rendered.decode()))
+
+    def test_streamed_page_matches_rendered(self):
+        for url in FEEDS:
+            with self.subTest(url=url):
+                streamed = b''.join(
+                    self.authorized_client.get(url).streaming_content)
+                with self.settings(POSTS_STREAMING_FEEDS=False):
+                    cache.clear()
+                    rendered = self.authorized_client.get(url).content
+                self.assertEqual(squeeze(streamed.decode()),
+                                 squeeze(rendered.decode()))
+                self.assertEqual(streamed.count(b'<hr>'),
+                                 len(self.texts) - 1)
+
+    @override_settings(POSTS_FEED_CACHE_TIMEOUT=60)
+    def test_anonymous_page_is_cached_after_stream(self):
+        streamed = b''.join(
+            self.guest_client.get(INDEX_PAGE).streaming_content)
+        response = self.guest_client.get(INDEX_PAGE)
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.content, streamed)
@@ -0,0 +1,135 @@
+import os
+import tempfile
+from io import StringIO
+
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import CommandError, call_command
+from django.test import RequestFactory, SimpleTestCase
+
+from context_processors import provides
+from context_processors import year as year_module
+from posts.metrics import _local, Timings
+from posts.templating import (DjangoTemplates, ProcessorContext,
+                              parse_times, project_templates, warm_templates)
+
+
+def make_backend(dirs):
+    # как в продакшене: без debug Django сам включает кеширующий загрузчик
+    options = settings.TEMPLATES[0]['OPTIONS']
+    return DjangoTemplates({
+        'NAME': 'warm', 'DIRS': dirs, 'APP_DIRS': True,
+        'OPTIONS': {'debug': False,
+                    'context_processors': options['context_processors']},
+    })
+
+
+class TemplatingTests(SimpleTestCase):
+    def setUp(self):
+        self.backend = make_backend(settings.TEMPLATES[0]['DIRS'])
+
+    def test_project_templates_skip_packages(self):
+        names = dict(project_templates(self.backend))
+        for name in ('base.html', 'includes/index_post.html',
+                     'signup.html'):
+            with self.subTest(name=name):
+                self.assertIn(name, names)
+        self.assertNotIn('admin/base.html', names)
+
+    def test_warm_fills_cached_loader(self):
+        warmed = warm_templates(self.backend)
+        loader, = self.backend.engine.template_loaders
+        self.assertEqual(warmed, len(project_templates(self.backend)))
+        self.assertIn('includes/index_post.html', loader.get_template_cache)
+
+    def test_check_templates_reports_every_template(self):
+        out = StringIO()
+        call_command('check_templates', stdout=out)
+        self.assertIn('index.html', out.getvalue())
+        self.assertIn('Всего шаблонов', out.getvalue())
+
+    def test_syntax_error_reported(self):
+        with tempfile.TemporaryDirectory(dir=settings.BASE_DIR) as directory:
+            with open(os.path.join(directory, 'broken.html'), 'w') as file:
+                file.write('{% if %}')
+            backend = make_backend([directory])
+            errors = {name: error
+                      for name, _, error in parse_times(backend)}
+            self.assertIsNotNone(errors['broken.html'])
+            self.assertEqual(warm_templates(backend),
+                             len(project_templates(backend)) - 1)
+
+    def test_undecodable_template_reported(self):
+        with tempfile.TemporaryDirectory(dir=settings.BASE_DIR) as directory:
+            with open(os.path.join(directory, 'cp1251.html'), 'wb') as file:
+                file.write('Привет'.encode('cp1251'))
+            backend = make_backend([directory])
+            self.assertEqual(warm_templates(backend),
+                             len(project_templates(backend)) - 1)
+            out = StringIO()
+            with mock.patch('posts.templating.project_backend',
+                            return_value=backend):
+                with self.assertRaises(CommandError):
+                    call_command('check_templates', stdout=out)
+            self.assertIn('cp1251.html  ОШИБКА', out.getvalue())
+
+
+class LazyContextProcessorTests(SimpleTestCase):
+    def setUp(self):
+        self.calls = []
+
+        @provides('answer')
+        def answer(request):
+            self.calls.append('answer')
+            return {'answer': 42}
+
+        def eager(request):
+            self.calls.append('eager')
+            return {'eager': True}
+
+        self.processors = (answer, eager)
+        self.request = RequestFactory().get('/')
+
+    def test_processor_runs_only_when_key_is_read(self):
+        context = ProcessorContext(self.request, self.processors)
+        self.assertEqual(self.calls, ['eager'])
+        self.assertNotIn('missing', context)
+        self.assertEqual(context['answer'], 42)
+        self.assertEqual(context['answer'], 42)
+        self.assertEqual(self.calls, ['eager', 'answer'])
+
+    def test_unused_year_is_not_computed(self):
+        backend = make_backend([])
+        request = self.request
+        request.user = AnonymousUser()
+        with mock.patch.object(year_module, 'current_year',
+                               return_value=2000) as current_year:
+            self.assertEqual(
+                backend.from_string('{{ request.path }}').render(
+                    request=request), '/')
+            current_year.assert_not_called()
+            self.assertEqual(
+                backend.from_string('{{ year }}').render(request=request),
+                '2000')
+            current_year.assert_called_once()
+
+    def test_processor_time_is_recorded(self):
+        timings = _local.timings = Timings()
+        try:
+            ProcessorContext(self.request, self.processors)['answer']
+        finally:
+            _local.timings = None
+        self.assertEqual(len(timings.processors), 2)
+        self.assertTrue(all(name.endswith(('answer', 'eager'))
+                            for name in timings.processors))
+
+    def test_year_is_memoized_per_day(self):
+        with mock.patch.object(year_module, '_expires', 0), \
+                mock.patch.object(year_module.dt, 'datetime',
+                                  wraps=year_module.dt.datetime) as datetime:
+            first = year_module.current_year()
+            year_module.current_year()
+            self.assertEqual(datetime.fromtimestamp.call_count, 1)
+        self.assertEqual(first, year_module.dt.date.today().year)
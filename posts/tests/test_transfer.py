@@ -0,0 +1,80 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from posts.models import Group, Post, User
+
+
+TEXT = 'test post'
+TEXT2 = 'new post'
+USERNAME = 'testname'
+TITLE = 'testtitle'
+SLUG = 'testslug'
+
+
+class TransferCommandsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username=USERNAME)
+        cls.group = Group.objects.create(title=TITLE, slug=SLUG)
+        Post.objects.create(text=TEXT, author=cls.author, group=cls.group)
+        Post.objects.create(text=TEXT2, author=cls.author)
+        cls.tmp_dir = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir, ignore_errors=True)
+        super().tearDownClass()
+
+    def posts(self):
+        return list(Post.objects.order_by('pk').values_list(
+            'text', 'pub_date', 'author', 'group'))
+
+    def test_round_trip(self):
+        expected = self.posts()
+        for file_format in ('jsonl', 'csv'):
+            with self.subTest(file_format=file_format):
+                path = os.path.join(self.tmp_dir, f'posts.{file_format}')
+                call_command('export_posts', path, stderr=io.StringIO())
+                Post.objects.all().delete()
+                call_command('import_posts', path, batch_size=1,
+                             stdout=io.StringIO())
+                self.assertEqual(self.posts(), expected)
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.posts_count, 1)
+        self.assertEqual(
+            User.objects.get(username=USERNAME).post_counter.posts_count, 2)
+
+    def test_unknown_author_is_skipped(self):
+        path = os.path.join(self.tmp_dir, 'unknown.jsonl')
+        with open(path, 'w', encoding='utf-8') as stream:
+            for author in ('nobody', USERNAME):
+                stream.write(json.dumps({'text': TEXT, 'author': author,
+                                         'group': SLUG}) + '\n')
+        stdout = io.StringIO()
+        call_command('import_posts', path, stdout=stdout,
+                     stderr=io.StringIO())
+        self.assertIn('пропущено: 1', stdout.getvalue())
+        self.assertEqual(Post.objects.filter(group=self.group).count(), 2)
+
+    def test_failed_import_still_recounts(self):
+        path = os.path.join(self.tmp_dir, 'broken.jsonl')
+        with open(path, 'w', encoding='utf-8') as stream:
+            stream.write(json.dumps({'text': TEXT, 'author': USERNAME,
+                                     'group': SLUG}) + '\n')
+            stream.write(json.dumps({'text': TEXT, 'author': USERNAME,
+                                     'pub_date': 'вчера'}) + '\n')
+        count = Post.objects.filter(group=self.group).count()
+        with self.assertRaises(CommandError):
+            call_command('import_posts', path, batch_size=1,
+                         stdout=io.StringIO())
+        # первая пачка уже в базе, и счётчик группы её учёл
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.posts_count, count + 1)
+        self.assertTrue(Post._meta.get_field('pub_date').auto_now_add)
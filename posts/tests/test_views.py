@@ -5,7 +5,9 @@ import tempfile
 from django import forms
 from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import Client, TestCase, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse, resolve, Resolver404
 
 from posts.models import Group, Post, User
@@ -103,7 +105,7 @@ class PostsPagesTests(TestCase):
         form_fields = {
             'text': forms.CharField,
             'group': forms.ModelChoiceField,
-            #'image': forms.ImageField
+            'image': forms.ImageField,
         }
         for value, expected in form_fields.items():
             with self.subTest(value=value):
@@ -130,6 +132,84 @@ class PostsPagesTests(TestCase):
         self.assertEqual(response.status_code, 404)
 
 
+class FeedQueriesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username=USERNAME)
+        cls.group = Group.objects.create(
+            title=TITLE,
+            description=DESCRIPTION,
+            slug=SLUG,
+        )
+        for i in range(12):
+            Post.objects.create(text=f'{TEXT} {i}', author=cls.author,
+                                group=cls.group)
+            Post.objects.create(
+                text=f'{TEXT2} {i}',
+                author=User.objects.create(username=f'{USERNAME}{i}',
+                                           first_name=f'name{i}'),
+                group=Group.objects.create(title=f'{TITLE}{i}',
+                                           slug=f'{SLUG}{i}'),
+            )
+
+    def count_queries(self, url, per_page):
+        with override_settings(POSTS_PER_PAGE=per_page):
+            with CaptureQueriesContext(connection) as queries:
+                response = Client().get(url)
+        self.assertEqual(len(response.context.get('page')), per_page)
+        return len(queries)
+
+    def test_feed_queries_do_not_depend_on_page_size(self):
+        for url in (INDEX_PAGE, GROUP_PAGE, PROFILE_PAGE):
+            with self.subTest(url=url):
+                self.assertEqual(self.count_queries(url, 1),
+                                 self.count_queries(url, 10))
+
+
+class PostDetailQueriesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post = Post.objects.create(
+            text=TEXT,
+            author=User.objects.create(username=USERNAME),
+            group=Group.objects.create(title=TITLE, slug=SLUG),
+        )
+        cls.post2 = Post.objects.create(
+            text=TEXT2,
+            author=User.objects.create(username=USERNAME + '2'),
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.post.author)
+
+    def test_post_page_takes_one_query(self):
+        url = reverse('post', kwargs={'username': USERNAME,
+                                      'post_id': self.post.pk})
+        with self.assertNumQueries(1):
+            response = self.guest_client.get(url)
+        self.assertEqual(response.context['author'], self.post.author)
+        self.assertEqual(response.context['posts_count'], 1)
+
+    def test_post_edit_page_takes_one_query_for_post(self):
+        url = reverse('post_edit', kwargs={'username': USERNAME,
+                                           'post_id': self.post.pk})
+        self.authorized_client.get(url)
+        # пользователь, пост и список групп для формы
+        with self.assertNumQueries(3):
+            self.authorized_client.get(url)
+
+    def test_post_of_another_author_is_not_found(self):
+        for name in ('post', 'post_edit'):
+            with self.subTest(name=name):
+                response = self.authorized_client.get(reverse(name, kwargs={
+                    'username': USERNAME, 'post_id': self.post2.pk}))
+                self.assertEqual(response.status_code, 404)
+
+
 class TestError404(TestCase):
     def setUp(self):
         self.client = Client()
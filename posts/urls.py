@@ -1,14 +1,26 @@
 from django.urls import path
 
-from . import views
+from . import feeds, views
 
 urlpatterns = [
     path("404/", views.page_not_found, name="error404"),
     path("500/", views.server_error, name="error500"),
+    path("feed/atom/", feeds.index_atom, name="index_feed_atom"),
+    path("feed/json/", feeds.index_json, name="index_feed_json"),
     path("group/<slug:slug>/", views.group_posts, name="group_posts"),
+    path("group/<slug:slug>/feed/atom/", feeds.group_atom,
+         name="group_feed_atom"),
+    path("group/<slug:slug>/feed/json/", feeds.group_json,
+         name="group_feed_json"),
+    path("metrics/", views.request_metrics, name="request_metrics"),
     path("new/", views.NewPost.as_view(), name="new_post"),
+    path("search/", views.search, name="search"),
     path("", views.index, name="index"),
     path('<str:username>/', views.profile, name='profile'),
+    path('<str:username>/feed/atom/', feeds.author_atom,
+         name='profile_feed_atom'),
+    path('<str:username>/feed/json/', feeds.author_json,
+         name='profile_feed_json'),
     path('<str:username>/<int:post_id>/', views.post_view, name='post'),
     path('<str:username>/<int:post_id>/edit/', views.post_edit,
          name='post_edit'),
@@ -0,0 +1,95 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+AUTHORS_VERSION = "posts:version:authors"
+GROUPS_VERSION = "posts:version:groups"
+FLATPAGES_VERSION = "posts:version:flatpages"
+# параметры, от которых зависит страница ленты; остальные не попадают
+# в ключ, иначе любая строка запроса заводила бы новую запись в кеше
+FEED_PAGE_PARAMS = ("page", "after", "before")
+
+
+def post_key(pk):
+    return f"posts:version:post:{pk}"
+
+
+def group_key(pk):
+    return f"posts:version:group:{pk}"
+
+
+def author_key(pk):
+    return f"posts:version:author:{pk}"
+
+
+def user_key(pk):
+    return f"posts:version:user:{pk}"
+
+
+def feed_key(group_id=None, author_id=None):
+    if group_id is not None:
+        return f"posts:version:feed:group:{group_id}"
+    if author_id is not None:
+        return f"posts:version:feed:author:{author_id}"
+    return "posts:version:feed:index"
+
+
+def _fresh_version():
+    # не совпадает ни с одной из прежних версий, даже если ключ
+    # версии был вытеснен из кеша
+    return time.time_ns()
+
+
+def get_versions(keys):
+    versions = cache.get_many(keys)
+    missing = {key: _fresh_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return ".".join(str(versions[key]) for key in keys)
+
+
+def bump(*keys):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _fresh_version(), None)
+
+
+def expire_post(post, group_ids):
+    """Сбрасывает карточку поста и все ленты, в которых он виден."""
+    keys = [post_key(post.pk), feed_key(), feed_key(author_id=post.author_id)]
+    keys.extend(feed_key(group_id=group_id)
+                for group_id in group_ids if group_id is not None)
+    bump(*keys)
+
+
+def post_card_version(post):
+    version = get_versions([post_key(post.pk), group_key(post.group_id),
+                            author_key(post.author_id)])
+    # отстающая реплика может отдать старый пост уже после сброса
+    # версии; с датой правки в ключе он не займёт место нового
+    return f"{version}.{post.updated.timestamp()}"
+
+
+def feed_page_key(request, keys):
+    """
+    Ключ кеша страницы ленты для анонимного посетителя.
+
+    Возвращает None, если страницу кешировать нельзя.
+    """
+    if (not settings.POSTS_FEED_CACHE_TIMEOUT
+            or request.user.is_authenticated):
+        return None
+    # название группы видно в карточках любой ленты, в том числе в профиле,
+    # версию ленты которого правка группы не сбрасывает
+    version = get_versions(list(keys) + [AUTHORS_VERSION, GROUPS_VERSION])
+    query = urlencode([(name, request.GET[name]) for name in FEED_PAGE_PARAMS
+                       if name in request.GET])
+    # в ключе memcached нельзя пробелы и больше 250 символов
+    page = hashlib.md5(f"{request.path}?{query}".encode()).hexdigest()
+    return f"posts:page:{page}:{version}"
@@ -1,31 +1,100 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
 from django.core.paginator import Paginator
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, render, redirect
 from django.urls import reverse_lazy
+from django.views.decorators.http import condition
 from django.views.generic import CreateView, UpdateView
 
+from .conditional import (author_post, post_etag, profile_author,
+                          profile_etag)
 from .forms import PostForm
-from .models import Group, Post, User
-
-
+from .metrics import registry
+from .counters import author_posts_count, index_count
+from .models import Group, Post
+from .paginators import CursorPaginator
+from .routers import replica_reads
+from .search import search_posts
+from .streaming import stream_feed
+from .versions import feed_key, feed_page_key
+
+
+def paginate(request, post_list, count):
+    """
+    Пагинатор и страница ленты.
+
+    count — функция, возвращающая количество постов из счётчиков, без
+    COUNT(*). В режиме курсора номера страниц не нужны, и её вызывает
+    только шаблон, который показывает итог.
+    """
+    if settings.POSTS_PAGINATION == 'cursor':
+        paginator = CursorPaginator(post_list, settings.POSTS_PER_PAGE,
+                                    count=count)
+        page = paginator.get_page(after=request.GET.get('after'),
+                                  before=request.GET.get('before'))
+    else:
+        paginator = Paginator(post_list, settings.POSTS_PER_PAGE)
+        paginator.count = count()
+        page = paginator.get_page(request.GET.get('page'))
+    return paginator, page
+
+
+def render_feed(request, template_name, context, version_key,
+                card_template):
+    """
+    render() для лент с кешем целой страницы для анонимных посетителей.
+
+    Посты страницы выбираются лениво, при рендере, поэтому попадание
+    в кеш обходится без запросов к постам. С POSTS_STREAMING_FEEDS
+    страница отдаётся потоком, карточка за карточкой.
+    """
+    page_key = feed_page_key(request, [version_key])
+    if page_key is not None:
+        content = cache.get(page_key)
+        if content is not None:
+            return HttpResponse(content)
+    if settings.POSTS_STREAMING_FEEDS:
+        return stream_feed(request, template_name, context, card_template,
+                           page_key, settings.POSTS_FEED_CACHE_TIMEOUT)
+    response = render(request, template_name, context)
+    if page_key is not None:
+        cache.set(page_key, response.content,
+                  settings.POSTS_FEED_CACHE_TIMEOUT)
+    return response
+
+
+@replica_reads
 def index(request):
-    post_list = Post.objects.select_related('group')
-    paginator = Paginator(post_list, 10)
-    page_number = request.GET.get('page')
-    page = paginator.get_page(page_number)
-    return render(request, "index.html", {
-        'page': page, "paginator": paginator, })
+    post_list = Post.objects.for_feed()
+    paginator, page = paginate(request, post_list,
+                               lambda: index_count(post_list))
+    return render_feed(request, "index.html", {
+        'page': page, "paginator": paginator, }, feed_key(),
+        "includes/index_post.html")
 
 
+@replica_reads
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    post_list = group.posts.all()
-    paginator = Paginator(post_list, 10)
-    page_number = request.GET.get('page')
-    page = paginator.get_page(page_number)
-    return render(request, "group.html", {
-        "group": group, "page": page, "paginator": paginator, })
+    post_list = Post.objects.for_feed().filter(group=group)
+    paginator, page = paginate(request, post_list,
+                               lambda: group.posts_count)
+    return render_feed(request, "group.html", {
+        "group": group, "page": page, "paginator": paginator, },
+        feed_key(group_id=group.pk), "includes/group_post.html")
+
+
+def search(request):
+    query = request.GET.get('q', '').strip()
+    post_list = search_posts(Post.objects.for_feed(), query)
+    paginator = Paginator(post_list, settings.POSTS_PER_PAGE)
+    page = paginator.get_page(request.GET.get('page'))
+    return render(request, "search.html", {
+        "query": query, "page": page, "paginator": paginator, })
 
 
 class NewPost(LoginRequiredMixin, CreateView):
@@ -40,44 +109,55 @@ class NewPost(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
+@replica_reads
+# без Last-Modified: удаление поста или переименование группы не сдвигает
+# дату последней правки, а ETag учитывает и счётчики, и версии
+@condition(etag_func=profile_etag)
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    post_list = author.posts.all()
-    paginator = Paginator(post_list, 10)
-    page_number = request.GET.get('page')
-    page = paginator.get_page(page_number)
-    return render(request, "profile.html", {
+    author = profile_author(request, username)
+    post_list = Post.objects.for_feed().filter(author=author)
+    paginator, page = paginate(request, post_list,
+                               lambda: author_posts_count(author))
+    return render_feed(request, "profile.html", {
         "author": author,
         "page": page,
-        "paginator": paginator
-    })
+        "paginator": paginator,
+        "is_author": request.user == author,
+    }, feed_key(author_id=author.pk), "includes/profile_post.html")
 
 
+@replica_reads
+@condition(etag_func=post_etag)
 def post_view(request, username, post_id):
-    author = get_object_or_404(User, username=username)
-    post = get_object_or_404(Post, id=post_id)
+    post = author_post(request, username, post_id)
     return render(request, "post.html", {
-        "author": author,
+        "author": post.author,
         "post": post,
+        "posts_count": author_posts_count(post.author),
     })
 
 @login_required
 def post_edit(request, username, post_id):
-    author = get_object_or_404(User, username=username)
-    if request.user.username != author.username:
+    if request.user.username != username:
         return redirect('post', username, post_id)
-    post = get_object_or_404(Post, id=post_id)
-    form = PostForm(instance=post)
+    post = get_object_or_404(Post.objects.of_author(username, post_id))
     form = PostForm(request.POST or None, files=request.FILES or None,
                     instance=post)
     if form.is_valid():
         form.save()
         return redirect('post', username, post_id)
     return render(request, "new_post.html",
-                  {"author": author, "form": form,
+                  {"author": post.author, "form": form,
                    'post': post})
 
 
+@staff_member_required
+def request_metrics(request):
+    """Гистограммы замеров запросов, накопленные этим процессом."""
+    return JsonResponse(registry.snapshot(),
+                        json_dumps_params={"ensure_ascii": False})
+
+
 def page_not_found(request, exception=None):
     return render(
         request,
@@ -1,11 +1,43 @@
+from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
+from django.urls import NoReverseMatch, Resolver404, resolve, reverse
 
 
 User = get_user_model()
 
+# адреса автора: каждый должен вести к своему представлению, а не
+# к странице сайта вроде /search/ или /metrics/ с тем же первым сегментом
+PROFILE_URLS = (
+    ("profile", {}),
+    ("profile_feed_atom", {}),
+    ("profile_feed_json", {}),
+    ("post", {"post_id": 1}),
+    ("post_edit", {"post_id": 1}),
+)
+
+
+def username_is_routable(username):
+    """Ведут ли адреса профиля и постов с этим именем к ним самим."""
+    for name, kwargs in PROFILE_URLS:
+        try:
+            url = reverse(name, kwargs=dict(kwargs, username=username))
+            if resolve(url).url_name != name:
+                return False
+        except (NoReverseMatch, Resolver404):
+            return False
+    return True
+
 
 class CreationForm(UserCreationForm):
     class Meta(UserCreationForm.Meta):
         model = User
         fields = ("first_name", "last_name", "username", "email")
+
+    def clean_username(self):
+        username = self.cleaned_data["username"]
+        if not username_is_routable(username):
+            raise forms.ValidationError(
+                "Это имя занято адресом страницы сайта, выберите другое.",
+                code="reserved_username")
+        return username
@@ -0,0 +1,122 @@
+import email
+import json
+import uuid
+from datetime import timedelta
+from email.header import decode_header, make_header
+from email.message import Message
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.message import MIMEMixin
+from django.db.models import F, Q
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils import timezone
+
+from .models import QueuedEmail
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """
+    Складывает письма в таблицу вместо отправки.
+
+    Запрос, отправивший письмо, не ждёт почтовый сервер: письма
+    отправляет команда send_queued_mail через MAIL_QUEUE_DELIVERY_BACKEND.
+    """
+
+    def send_messages(self, email_messages):
+        # в таблице только данные: готовый MIME и конверт письма
+        queued = [QueuedEmail(message=message.message().as_bytes(),
+                              from_email=message.from_email,
+                              recipients=json.dumps(message.recipients()))
+                  for message in email_messages if message.recipients()]
+        QueuedEmail.objects.bulk_create(queued)
+        return len(queued)
+
+
+class StoredMIMEMessage(MIMEMixin, Message):
+    """Разобранное письмо из очереди с as_bytes(linesep=...), как у Django."""
+
+
+class StoredEmailMessage(EmailMessage):
+    """
+    Письмо из очереди для любого почтового бэкенда.
+
+    message() отдаёт сохранённый MIME как есть, без повторной сборки,
+    а получатели берутся из конверта: скрытых копий в заголовках нет.
+    """
+
+    def __init__(self, queued):
+        self.mime = email.message_from_bytes(bytes(queued.message),
+                                             _class=StoredMIMEMessage)
+        subject = str(make_header(decode_header(self.mime["Subject"] or "")))
+        super().__init__(subject=subject, from_email=queued.from_email)
+        self.envelope_recipients = json.loads(queued.recipients)
+
+    def message(self):
+        return self.mime
+
+    def recipients(self):
+        return self.envelope_recipients
+
+
+def claim_batch(batch_size):
+    """
+    Берёт в работу до batch_size писем, которые никто не отправляет.
+
+    Метка ставится одним UPDATE с проверкой, что письмо свободно, поэтому
+    одновременно запущенные отправители не получат одно письмо дважды;
+    select_for_update для этого не годится, SQLite его не поддерживает.
+    """
+    now = timezone.now()
+    free = Q(claimed_until__isnull=True) | Q(claimed_until__lt=now)
+    candidates = list(QueuedEmail.objects.filter(
+        free, attempts__lt=settings.MAIL_QUEUE_MAX_ATTEMPTS,
+    ).values_list("pk", flat=True)[:batch_size])
+    if not candidates:
+        return []
+    claim = uuid.uuid4().hex
+    QueuedEmail.objects.filter(free, pk__in=candidates).update(
+        claim=claim, claimed_until=now + timedelta(
+            seconds=settings.MAIL_QUEUE_CLAIM_TIMEOUT))
+    return list(QueuedEmail.objects.filter(claim=claim))
+
+
+def send_batch(batch_size=None):
+    """
+    Отправляет пачку писем из очереди через одно соединение.
+
+    Отправленные письма удаляются из очереди, у неотправленных
+    растёт счётчик попыток, и они снова становятся свободны.
+    Возвращает число отправленных писем.
+    """
+    batch = claim_batch(batch_size or settings.MAIL_QUEUE_BATCH_SIZE)
+    if not batch:
+        return 0
+    sent = []
+    connection = get_connection(settings.MAIL_QUEUE_DELIVERY_BACKEND)
+    try:
+        connection.open()
+    except Exception as error:
+        QueuedEmail.objects.filter(pk__in=[queued.pk for queued in batch]) \
+            .update(attempts=F("attempts") + 1, last_error=repr(error),
+                    claim="", claimed_until=None)
+        return 0
+    # открытое соединение send_messages не закрывает, так что на всю
+    # пачку приходится одна SMTP-сессия
+    try:
+        for queued in batch:
+            try:
+                connection.send_messages([StoredEmailMessage(queued)])
+            except Exception as error:
+                queued.attempts += 1
+                queued.last_error = repr(error)
+                queued.claim = ""
+                queued.claimed_until = None
+                queued.save(update_fields=["attempts", "last_error",
+                                           "claim", "claimed_until"])
+            else:
+                sent.append(queued.pk)
+    finally:
+        connection.close()
+    QueuedEmail.objects.filter(pk__in=sent).delete()
+    return len(sent)
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.mail import send_batch
+
+
+class Command(BaseCommand):
+    help = "Отправляет письма из очереди пачками"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument("--loop", action="store_true",
+                            help="не выходить, а ждать новых писем")
+        parser.add_argument("--interval", type=float, default=5,
+                            help="пауза между проверками очереди, секунд")
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            sent = send_batch(options["batch_size"])
+            total += sent
+            if sent:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS(f"Отправлено писем: {total}"))
@@ -0,0 +1,29 @@
+# Generated by Django 2.2.6 on 2026-10-18 18:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedEmail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('message', models.BinaryField(verbose_name='письмо')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='поставлено в очередь')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='попыток отправки')),
+                ('last_error', models.TextField(blank=True, verbose_name='последняя ошибка')),
+            ],
+            options={
+                'verbose_name': 'Письмо в очереди',
+                'verbose_name_plural': 'Письма в очереди',
+                'ordering': ['pk'],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.6 on 2026-10-18 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='queuedemail',
+            name='claim',
+            field=models.CharField(blank=True, max_length=32, verbose_name='взято в работу'),
+        ),
+        migrations.AddField(
+            model_name='queuedemail',
+            name='claimed_until',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='взято до'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+import json
+import pickle
+
+from django.db import migrations, models
+
+
+def unpickle_queue(apps, schema_editor):
+    # последний раз, когда очередь читается через pickle: строки до этой
+    # миграции записал только QueuedEmailBackend
+    QueuedEmail = apps.get_model('users', 'QueuedEmail')
+    for queued in QueuedEmail.objects.iterator():
+        message = pickle.loads(queued.message)
+        queued.message = message.message().as_bytes()
+        queued.from_email = message.from_email
+        queued.recipients = json.dumps(message.recipients())
+        queued.save(update_fields=['message', 'from_email', 'recipients'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_queuedemail_claim'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='queuedemail',
+            name='from_email',
+            field=models.CharField(default='', max_length=255, verbose_name='отправитель'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='queuedemail',
+            name='recipients',
+            field=models.TextField(default='[]', verbose_name='получатели (JSON)'),
+        ),
+        migrations.RunPython(unpickle_queue, migrations.RunPython.noop),
+    ]
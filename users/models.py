@@ -0,0 +1,26 @@
+from django.db import models
+
+
+class QueuedEmail(models.Model):
+    """Письмо, которое ждёт отправки воркером send_queued_mail."""
+
+    # готовое письмо в MIME, с вложениями и HTML-версией, и его конверт:
+    # скрытых копий в заголовках нет, поэтому получатели хранятся отдельно
+    message = models.BinaryField("письмо")
+    from_email = models.CharField("отправитель", max_length=255)
+    recipients = models.TextField("получатели (JSON)", default="[]")
+    created = models.DateTimeField("поставлено в очередь", auto_now_add=True)
+    attempts = models.PositiveIntegerField("попыток отправки", default=0)
+    last_error = models.TextField("последняя ошибка", blank=True)
+    # метка send_batch, который взял письмо в работу, и срок, после
+    # которого письмо упавшего отправителя снова можно взять
+    claim = models.CharField("взято в работу", max_length=32, blank=True)
+    claimed_until = models.DateTimeField("взято до", null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Письмо в очереди"
+        verbose_name_plural = "Письма в очереди"
+        ordering = ["pk"]
+
+    def __str__(self):
+        return f"{self.pk}: {self.created}"
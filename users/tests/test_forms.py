@@ -0,0 +1,26 @@
+from django.test import TestCase
+
+from users.forms import CreationForm, username_is_routable
+
+PASSWORD = 'Yatube-signup-42'
+
+
+class CreationFormTests(TestCase):
+    def form(self, username):
+        return CreationForm({'username': username, 'password1': PASSWORD,
+                             'password2': PASSWORD})
+
+    def test_site_routes_are_reserved(self):
+        for username in ('search', 'metrics', 'new', 'group', 'admin',
+                         'about-author', '404'):
+            with self.subTest(username=username):
+                self.assertFalse(username_is_routable(username))
+                form = self.form(username)
+                self.assertFalse(form.is_valid())
+                self.assertEqual(form.errors.as_data()['username'][0].code,
+                                 'reserved_username')
+
+    def test_ordinary_username_is_accepted(self):
+        for username in ('leo', 'feed', 'searcher'):
+            with self.subTest(username=username):
+                self.assertTrue(self.form(username).is_valid())
@@ -0,0 +1,100 @@
+import io
+from datetime import timedelta
+
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import User
+from users.mail import send_batch
+from users.models import QueuedEmail
+from users.tests.smtp import LocalSMTPServer
+
+EMAIL = 'author@example.com'
+QUEUED = 'users.mail.QueuedEmailBackend'
+SMTP = 'django.core.mail.backends.smtp.EmailBackend'
+LOCMEM = 'django.core.mail.backends.locmem.EmailBackend'
+
+
+def send(count):
+    for i in range(count):
+        mail.send_mail(f'subject {i}', f'body {i}', 'yatube@example.com',
+                       [EMAIL])
+
+
+@override_settings(EMAIL_BACKEND=QUEUED)
+class QueuedEmailTests(TestCase):
+    def test_password_reset_only_queues_mail(self):
+        User.objects.create(username='author', email=EMAIL)
+        response = Client().post(reverse('password_reset'), {'email': EMAIL})
+        self.assertRedirects(response, reverse('password_reset_done'))
+        self.assertEqual(QueuedEmail.objects.count(), 1)
+        self.assertEqual(mail.outbox, [])
+
+    @override_settings(MAIL_QUEUE_DELIVERY_BACKEND=SMTP,
+                       EMAIL_HOST='127.0.0.1', MAIL_QUEUE_BATCH_SIZE=3)
+    def test_batches_reuse_one_smtp_connection(self):
+        send(5)
+        with LocalSMTPServer() as server:
+            with override_settings(EMAIL_PORT=server.port):
+                call_command('send_queued_mail', stdout=io.StringIO())
+        self.assertEqual(len(server.messages), 5)
+        # две пачки: 3 и 2 письма
+        self.assertEqual(server.connections, 2)
+        self.assertFalse(QueuedEmail.objects.exists())
+        sender, recipients, data = server.messages[0]
+        self.assertEqual(recipients, [f'<{EMAIL}>'])
+        self.assertIn('Subject: subject 0', data)
+
+    @override_settings(MAIL_QUEUE_DELIVERY_BACKEND=SMTP,
+                       EMAIL_HOST='127.0.0.1', EMAIL_PORT=1,
+                       MAIL_QUEUE_MAX_ATTEMPTS=2)
+    def test_failed_mail_stays_in_queue(self):
+        send(1)
+        self.assertEqual(send_batch(), 0)
+        self.assertEqual(send_batch(), 0)
+        queued = QueuedEmail.objects.get()
+        self.assertEqual(queued.attempts, 2)
+        self.assertIn('Connection', queued.last_error)
+        # исчерпавшее попытки письмо больше не берётся в работу
+        with override_settings(MAIL_QUEUE_DELIVERY_BACKEND=LOCMEM):
+            self.assertEqual(send_batch(), 0)
+        self.assertEqual(mail.outbox, [])
+
+    @override_settings(MAIL_QUEUE_DELIVERY_BACKEND=LOCMEM)
+    def test_claimed_mail_is_not_sent_twice(self):
+        send(2)
+        taken, free = QueuedEmail.objects.all()
+        # первое письмо уже отправляет другой send_batch
+        QueuedEmail.objects.filter(pk=taken.pk).update(
+            claim='other', claimed_until=timezone.now() + timedelta(minutes=1))
+        self.assertEqual(send_batch(), 1)
+        self.assertEqual(mail.outbox[0].subject, 'subject 1')
+        self.assertEqual(list(QueuedEmail.objects.all()), [taken])
+
+    @override_settings(MAIL_QUEUE_DELIVERY_BACKEND=LOCMEM)
+    def test_expired_claim_is_taken_again(self):
+        send(1)
+        QueuedEmail.objects.update(
+            claim='other', claimed_until=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(send_batch(), 1)
+        self.assertFalse(QueuedEmail.objects.exists())
+
+    @override_settings(MAIL_QUEUE_DELIVERY_BACKEND=LOCMEM)
+    def test_queue_stores_mime_and_envelope(self):
+        message = EmailMultiAlternatives('subject', 'body',
+                                         'yatube@example.com', [EMAIL],
+                                         bcc=['hidden@example.com'])
+        message.attach_alternative('<p>body</p>', 'text/html')
+        message.send()
+        queued = QueuedEmail.objects.get()
+        self.assertIn(b'Subject: subject', bytes(queued.message))
+        self.assertNotIn(b'hidden@example.com', bytes(queued.message))
+        self.assertEqual(send_batch(), 1)
+        sent, = mail.outbox
+        self.assertEqual(sent.subject, 'subject')
+        self.assertEqual(sent.recipients(), [EMAIL, 'hidden@example.com'])
+        self.assertIn(b'<p>body</p>', sent.message().as_bytes())
@@ -50,6 +50,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'posts.staticfiles.StaticFilesMiddleware',
+    'posts.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -57,6 +59,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'posts.routers.ReplicaMiddleware',
 ]
 
 ROOT_URLCONF = 'yatube.urls'
@@ -65,7 +68,7 @@ TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'posts.templating.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -90,6 +93,52 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'CONN_MAX_AGE': 0 if DEBUG else 600,
+    },
+    # копия основной базы только для чтения; её наполняет внешняя
+    # репликация, а используется она, только если указана в
+    # DATABASE_REPLICAS
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'replica.sqlite3'),
+        'CONN_MAX_AGE': 0 if DEBUG else 600,
+    },
+}
+
+# PRAGMA для каждого соединения с SQLite в продакшене: WAL, чтобы запись
+# не блокировала чтение, fsync только на контрольных точках, ожидание
+# блокировки вместо ошибки, mmap и кеш страниц побольше.
+# Пустой словарь — настройки SQLite по умолчанию.
+SQLITE_PRODUCTION_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    # отрицательное значение — размер в КиБ, а не в страницах
+    'cache_size': -64 * 1024,
+    'temp_store': 'memory',
+}
+SQLITE_PRAGMAS = {} if DEBUG else SQLITE_PRODUCTION_PRAGMAS
+
+DATABASE_ROUTERS = ['posts.routers.ReplicaRouter']
+
+# алиасы баз, с которых ленты читают посты и авторов
+DATABASE_REPLICAS = []
+
+# сколько секунд после записи пользователь читает с основной базы
+DATABASE_REPLICA_LAG = 10
+
+
+# Cache
+# https://docs.djangoproject.com/en/2.2/topics/cache/
+# Кеш в памяти процесса годится только для разработки: версии в кеше
+# (posts.versions) сбрасывают карточки, ленты и страницы на всех воркерах,
+# только если кеш у них общий. В продакшене — memcached или redis
+# (иначе предупреждение posts.W001).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
@@ -132,14 +181,39 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, "static")
+# исходники своей статики (bootstrap, jquery); collectstatic собирает
+# их вместе со статикой приложений в STATIC_ROOT
+ASSETS_DIR = os.path.join(BASE_DIR, "assets")
+STATICFILES_DIRS = [ASSETS_DIR] if os.path.isdir(ASSETS_DIR) else []
+# в продакшене имена с хешем содержимого и сжатые копии .gz/.br;
+# в разработке статика отдаётся как есть и без collectstatic
+STATICFILES_STORAGE = (
+    "django.contrib.staticfiles.storage.StaticFilesStorage" if DEBUG
+    else "posts.staticfiles.CompressedManifestStaticFilesStorage")
+# отдавать ли STATIC_ROOT из самого Django (posts.staticfiles), если
+# перед ним нет веб-сервера со статикой
+STATIC_SERVE = not DEBUG
+# сколько секунд браузер хранит файл с хешем в имени и без него
+STATIC_IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+STATIC_MAX_AGE = 60 * 60
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
-#  подключаем движок filebased.EmailBackend
-EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
+# письма сначала ложатся в очередь users.QueuedEmail, а отправляет их
+# команда send_queued_mail через MAIL_QUEUE_DELIVERY_BACKEND
+EMAIL_BACKEND = "users.mail.QueuedEmailBackend"
+#  подключаем движок filebased.EmailBackend; в продакшене — smtp.EmailBackend
+MAIL_QUEUE_DELIVERY_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
 # указываем директорию, в которую будут складываться файлы писем
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, "sent_emails")
+# сколько писем отправлять через одно соединение
+MAIL_QUEUE_BATCH_SIZE = 50
+# после стольких неудачных попыток письмо остаётся в очереди без отправки
+MAIL_QUEUE_MAX_ATTEMPTS = 5
+# сколько секунд письмо считается взятым в работу; если отправитель упал,
+# не отпустив письма, по истечении срока их возьмёт другой
+MAIL_QUEUE_CLAIM_TIMEOUT = 60 * 10
 
 # Login
 
@@ -148,3 +222,45 @@ LOGIN_REDIRECT_URL = "index"
 LOGOUT_REDIRECT_URL = "index"
 
 SITE_ID = 1
+
+# Пагинация лент: "page" — по номеру страницы (?page=N),
+# "cursor" — по ключу (pub_date, id) с токенами ?after=/?before=
+POSTS_PAGINATION = "page"
+POSTS_PER_PAGE = 10
+# сколько секунд счётчик постов ленты живёт в кеше до точного пересчёта
+POSTS_COUNT_TIMEOUT = 60 * 15
+# сколько секунд страница ленты для анонимов живёт в кеше;
+# 0 — не кешировать (в разработке страницы всегда рендерятся заново)
+POSTS_FEED_CACHE_TIMEOUT = 0 if DEBUG else 60
+# сколько последних постов отдают Atom и JSON-ленты
+POSTS_FEED_ITEMS = 20
+# сколько фоновых потоков нарезают копии картинок постов
+POSTS_IMAGE_WORKERS = 2
+
+# отдавать ли замеры запроса (SQL, шаблоны, полное время) в Server-Timing;
+# заголовок видит любой клиент, поэтому в продакшене он выключен,
+# а замеры есть в /metrics/ для персонала
+POSTS_SERVER_TIMING = DEBUG
+
+# разбирать ли все шаблоны проекта при старте WSGI-воркера; полезно только
+# с кеширующим загрузчиком, который Django включает при DEBUG = False
+TEMPLATES_WARM_ON_BOOT = not DEBUG
+
+# сколько секунд страница «об авторе» и подобные живут в кеше; это же
+# наибольшая задержка правки на других воркерах без общего кеша
+FLATPAGES_CACHE_TIMEOUT = 60 * 5
+
+# отдавать ли ленты потоком: шапка и меню сразу, затем карточки постов
+# по мере чтения из базы (posts.streaming)
+POSTS_STREAMING_FEEDS = False
+
+# сессия хранится в подписанной куке: ни запроса к django_session, ни
+# общего кеша не нужно. С общим кешем (memcached, redis) в CACHES можно
+# взять "django.contrib.sessions.backends.cached_db"; с кешем в памяти
+# процесса это запрещает проверка posts.E002
+SESSION_ENGINE = "django.contrib.sessions.backends.signed_cookies"
+# вошедшие пользователи берутся из памяти процесса (posts.auth)
+AUTHENTICATION_BACKENDS = ["posts.auth.CachedModelBackend"]
+# сколько пользователей помнит каждый процесс; 0 — всегда из базы;
+# больше нуля только с общим кешем (проверка posts.E001)
+AUTH_USER_CACHE_SIZE = 0
@@ -2,10 +2,10 @@ from django.conf import settings
 from django.conf.urls import handler404, handler500
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.contrib.flatpages import views
 from django.urls import include, path
 
 
+from posts.flatpages import flatpage
 from posts.views import server_error
 
 handler404 = "posts.views.page_not_found" # noqa
@@ -16,9 +16,9 @@ urlpatterns = [
     path('about/', include('django.contrib.flatpages.urls')),
     path("auth/", include("django.contrib.auth.urls")),
     path("admin/", admin.site.urls),
-    path('about-author/', views.flatpage, {'url': '/about-author/'},
+    path('about-author/', flatpage, {'url': '/about-author/'},
          name='about-author'),
-    path('about-spec/', views.flatpage, {'url': '/about-spec/'},
+    path('about-spec/', flatpage, {'url': '/about-spec/'},
          name='about-spec'),
     path("", include("posts.urls")),
 ]